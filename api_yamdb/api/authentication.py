@@ -0,0 +1,87 @@
+"""JWT-аутентификация по ролям из токена.
+
+get_token кладёт в AccessToken роль, флаги пользователя и версию
+токена. Для такого токена пользователь собирается из claims без запроса
+к БД; достаточно сверить версию токена с версией из кэша процесса.
+Смена имени, роли или флагов увеличивает User.token_version, и старые токены
+снова проходят через обычную загрузку пользователя из БД.
+Токены без claims обрабатываются как в JWTAuthentication.
+"""
+import time
+from threading import Lock
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import User
+
+CLAIMS = ('username', 'role', 'is_staff', 'is_superuser', 'token_version')
+
+_versions = {}
+_versions_lock = Lock()
+
+
+def access_token_for(user):
+    token = AccessToken.for_user(user)
+    if settings.JWT_ROLE_CLAIMS:
+        for claim in CLAIMS:
+            token[claim] = getattr(user, claim)
+    return token
+
+
+def get_token_version(user_id):
+    """Текущая версия токенов пользователя из кэша процесса."""
+    now = time.monotonic()
+    with _versions_lock:
+        cached = _versions.get(user_id)
+    if cached and cached[1] > now:
+        return cached[0]
+    version = User.objects.filter(
+        pk=user_id, is_active=True
+    ).values_list('token_version', flat=True).first()
+    set_token_version(user_id, version)
+    return version
+
+
+def set_token_version(user_id, version):
+    expires = time.monotonic() + settings.JWT_TOKEN_VERSION_TTL
+    with _versions_lock:
+        _versions[user_id] = (version, expires)
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in CLAIMS):
+            return super().get_user(validated_token)
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        version = validated_token['token_version']
+        if get_token_version(user_id) != version:
+            return super().get_user(validated_token)
+        user = User(
+            pk=user_id,
+            username=validated_token['username'],
+            role=validated_token['role'],
+            is_staff=validated_token['is_staff'],
+            is_superuser=validated_token['is_superuser'],
+            is_active=True,
+            token_version=version,
+        )
+        user._state.adding = False
+        user._state.db = 'default'
+        user.is_token_user = True
+        return user
+
+
+def get_db_user(user):
+    """Полный пользователь из БД вместо собранного из токена."""
+    if getattr(user, 'is_token_user', False):
+        try:
+            return User.objects.get(pk=user.pk)
+        except User.DoesNotExist:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found')
+    return user
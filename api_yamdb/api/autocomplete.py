@@ -0,0 +1,169 @@
+"""Автодополнение категорий, жанров и имён пользователей.
+
+Индекс живёт в памяти процесса: отсортированный список ключей для
+поиска по префиксу (bisect) и триграммы для совпадений в середине
+слова (пересечение списков триграмм с проверкой подстроки). Индекс
+строится при первом обращении, обновляется сигналами и
+перестраивается, если его версия изменилась в другом процессе. Версия
+у каждого индекса своя (``autocomplete:categories``, ...) и сдвигается
+после фиксации транзакции, только если изменились поля индекса.
+"""
+import bisect
+from collections import defaultdict
+from threading import RLock
+
+from django.db import transaction
+
+from reviews.models import Category, Genre, User
+
+from . import cache
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+
+def normalize(value):
+    return value.casefold()
+
+
+def trigrams(value):
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class AutocompleteIndex:
+    """Префиксный и триграммный индекс строк модели."""
+
+    def __init__(self, model, field, payload_fields, name,
+                 loaded_attr=None):
+        self.model = model
+        self.field = field
+        self.payload_fields = payload_fields
+        self.namespace = f'autocomplete:{name}'
+        # Атрибут объекта со значениями полей на момент загрузки из БД.
+        self.loaded_attr = loaded_attr
+        self.version = None
+        self._lock = RLock()
+        self._keys = []
+        self._payloads = {}
+        self._trigrams = defaultdict(set)
+
+    def payload(self, obj):
+        return {field: getattr(obj, field) for field in self.payload_fields}
+
+    def loaded_payload(self, obj):
+        """Поля индекса объекта до записи, если они известны."""
+        loaded = getattr(obj, self.loaded_attr or '', None)
+        if loaded is not None:
+            return {field: loaded.get(field) for field in self.payload_fields}
+        with self._lock:
+            if self.version is not None:
+                return self._payloads.get(obj.pk)
+        return None
+
+    def rebuild(self):
+        with self._lock:
+            version = cache.get_version(self.namespace)
+            self._keys = []
+            self._payloads = {}
+            self._trigrams = defaultdict(set)
+            rows = self.model.objects.values(
+                'pk', *self.payload_fields).iterator()
+            for row in rows:
+                pk = row.pop('pk')
+                self._insert(pk, row)
+            self._keys.sort()
+            self.version = version
+
+    def _insert(self, pk, payload, keep_sorted=False):
+        key = (normalize(payload[self.field]), pk)
+        if keep_sorted:
+            bisect.insort(self._keys, key)
+        else:
+            self._keys.append(key)
+        self._payloads[pk] = payload
+        for trigram in trigrams(key[0]):
+            self._trigrams[trigram].add(key)
+
+    def _remove(self, pk):
+        payload = self._payloads.pop(pk, None)
+        if payload is None:
+            return
+        key = (normalize(payload[self.field]), pk)
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+        for trigram in trigrams(key[0]):
+            self._trigrams[trigram].discard(key)
+
+    def changed(self):
+        """Сообщает другим процессам, что их индекс устарел."""
+        cache.bump_version(self.namespace)
+
+    def update(self, obj, created=False):
+        payload = self.payload(obj)
+        if not created and self.loaded_payload(obj) == payload:
+            return
+        transaction.on_commit(lambda: self._apply(obj.pk, payload))
+
+    def delete(self, pk):
+        transaction.on_commit(lambda: self._apply(pk, None))
+
+    def _apply(self, pk, payload):
+        self.changed()
+        with self._lock:
+            if self.version is None:
+                return
+            self._remove(pk)
+            if payload is not None:
+                self._insert(pk, payload, keep_sorted=True)
+            self.version = cache.get_version(self.namespace)
+
+    def reset(self):
+        with self._lock:
+            self.version = None
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Сначала совпадения по префиксу, затем по подстроке."""
+        query = normalize(query)
+        if not query:
+            return []
+        with self._lock:
+            if self.version != cache.get_version(self.namespace):
+                self.rebuild()
+            found = []
+            start = bisect.bisect_left(self._keys, (query,))
+            for key in self._keys[start:start + limit]:
+                if not key[0].startswith(query):
+                    break
+                found.append(key)
+            if len(found) < limit:
+                found.extend(self._containing(query, set(found),
+                                              limit - len(found)))
+            return [self._payloads[pk] for _, pk in found]
+
+    def _containing(self, query, exclude, limit):
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        postings = sorted(
+            (self._trigrams.get(trigram, set())
+             for trigram in query_trigrams),
+            key=len
+        )
+        candidates = [
+            (key[0].find(query), key)
+            for key in postings[0].intersection(*postings[1:])
+            if key not in exclude and query in key[0]
+        ]
+        candidates.sort()
+        return [key for _, key in candidates[:limit]]
+
+
+INDEXES = {
+    'categories': AutocompleteIndex(
+        Category, 'name', ('name', 'slug'), 'categories'),
+    'genres': AutocompleteIndex(Genre, 'name', ('name', 'slug'), 'genres'),
+    'users': AutocompleteIndex(
+        User, 'username', ('username',), 'users', '_loaded_claims'),
+}
+MODEL_INDEXES = {index.model: index for index in INDEXES.values()}
@@ -0,0 +1,114 @@
+"""Версионированный кэш ответов каталога.
+
+Ключ ответа включает версию пространства имён (``titles``,
+``categories``, ...). Запись в связанную таблицу сдвигает версию,
+и все ранее сохранённые ответы пространства становятся недостижимыми
+без перебора ключей. Версия — отметка времени в микросекундах, поэтому
+после вытеснения ключа версии из кэша старые ответы не «оживают».
+
+Версии, как и ответы, живут в кэше API_CACHE_ALIAS. Чтобы запись,
+обработанная одним воркером или командой управления, сбрасывала ETag
+остальных, кэш должен быть общим для процессов (Redis, Memcached,
+DatabaseCache). Ключ версии живёт API_CACHE_VERSION_TIMEOUT секунд:
+с локальным кэшем процесса устаревшие ETag отдаются не дольше этого.
+"""
+import hashlib
+import time
+from collections import Counter
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+VERSION_KEY = 'api:version:{namespace}'
+RESPONSE_KEY = 'api:response:{namespace}:{version}:{url_hash}'
+
+_stats = Counter()
+_stats_lock = Lock()
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def get_version(namespace):
+    cache = get_cache()
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(
+            key, time.time_ns() // 1000, settings.API_CACHE_VERSION_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*namespaces):
+    version = time.time_ns() // 1000
+    get_cache().set_many(
+        {VERSION_KEY.format(namespace=namespace): version
+         for namespace in namespaces},
+        settings.API_CACHE_VERSION_TIMEOUT
+    )
+
+
+class _PendingBump:
+    """Пространства, версии которых сдвинутся при фиксации транзакции."""
+
+    def __init__(self):
+        self.namespaces = set()
+
+    def __call__(self):
+        bump_version(*self.namespaces)
+
+
+def bump_version_on_commit(*namespaces):
+    """Сдвигает версии после фиксации текущей транзакции.
+
+    Иначе параллельный GET может прочитать новую версию, выбрать данные
+    из ещё старого снимка БД и сохранить их под новым ключом. Все
+    сдвиги одной транзакции (например, при каскадном удалении)
+    собираются в один.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        bump_version(*namespaces)
+        return
+    pending = getattr(connection, 'api_pending_bump', None)
+    if pending is None or not any(
+            entry[1] is pending for entry in connection.run_on_commit):
+        pending = connection.api_pending_bump = _PendingBump()
+        transaction.on_commit(pending)
+    pending.namespaces.update(namespaces)
+
+
+def response_key(namespace, url):
+    return RESPONSE_KEY.format(
+        namespace=namespace,
+        version=get_version(namespace),
+        url_hash=hashlib.md5(url.encode()).hexdigest(),
+    )
+
+
+def get_response(key):
+    return get_cache().get(key)
+
+
+def set_response(key, data):
+    get_cache().set(key, data, settings.API_CACHE_TIMEOUT)
+
+
+def record(namespace, hit):
+    with _stats_lock:
+        _stats[namespace, 'hits' if hit else 'misses'] += 1
+
+
+def get_stats():
+    stats = {}
+    with _stats_lock:
+        items = list(_stats.items())
+    for (namespace, kind), value in items:
+        stats.setdefault(namespace, {'hits': 0, 'misses': 0})[kind] = value
+    for namespace, counters in stats.items():
+        counters['version'] = get_version(namespace)
+    return stats
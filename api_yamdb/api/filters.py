@@ -1,5 +1,7 @@
 import django_filters
+from rest_framework import filters
 
+from reviews import search
 from reviews.models import Title
 
 
@@ -13,3 +15,14 @@ class TitleFilter(django_filters.FilterSet):
     class Meta:
         model = Title
         fields = ('category', 'genre', 'year', 'name')
+
+
+class TitleSearchFilter(filters.BaseFilterBackend):
+    """Полнотекстовый поиск ?search= с сортировкой по релевантности."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search.search_titles(queryset, query)
@@ -0,0 +1,194 @@
+"""Число SQL-запросов и задержки по эндпоинтам.
+
+MetricsMiddleware считает для каждого запроса количество и суммарное
+время SQL, самый медленный запрос, время сериализации (to_representation
+сериализаторов и рендеринг ответа) и полное время. Значения уходят
+в заголовок Server-Timing и в агрегаты по имени представления
+(``TitleViewSet.list``), из которых /api/v1/_metrics/ считает
+перцентили. Агрегаты хранятся в памяти процесса.
+"""
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from threading import Lock
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+PERCENTILES = (50, 95, 99)
+FIELDS = ('queries', 'db_ms', 'serialize_ms', 'total_ms')
+SLOWEST_SQL_LENGTH = 500
+
+_current = ContextVar('request_metrics', default=None)
+_samples = defaultdict(lambda: deque(maxlen=settings.API_METRICS_SAMPLES))
+_slowest = {}
+_lock = Lock()
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_name = 'unresolved'
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_sql = ''
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.render_start = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.queries += 1
+            self.db_time += duration
+            if duration > self.slowest_time:
+                self.slowest_time = duration
+                self.slowest_sql = sql
+
+    def as_sample(self):
+        return {
+            'queries': self.queries,
+            'db_ms': self.db_time * 1000,
+            'serialize_ms': self.serialize_time * 1000,
+            'total_ms': (time.perf_counter() - self.start) * 1000,
+        }
+
+
+@contextmanager
+def serializing():
+    """Засекает время сериализации текущего запроса.
+
+    Вложенные вызовы не засекаются отдельно: их время уже входит
+    во внешний.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics.serializing:
+        yield
+        return
+    metrics.serializing = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serialize_time += time.perf_counter() - start
+        metrics.serializing = False
+
+
+class TimedSerializerMixin:
+    """Добавляет время to_representation к метрикам запроса."""
+
+    def to_representation(self, instance):
+        with serializing():
+            return super().to_representation(instance)
+
+
+def view_name(request, view_func):
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return getattr(view_func, '__name__', 'unknown')
+    actions = getattr(view_func, 'actions', None) or {}
+    method = request.method.lower()
+    return f'{cls.__name__}.{actions.get(method, method)}'
+
+
+def server_timing(sample, metrics):
+    return ', '.join((
+        f'db;dur={sample["db_ms"]:.2f};desc="{sample["queries"]} queries"',
+        f'db-slowest;dur={metrics.slowest_time * 1000:.2f}',
+        f'serialize;dur={sample["serialize_ms"]:.2f}',
+        f'total;dur={sample["total_ms"]:.2f}',
+    ))
+
+
+def record(name, sample, metrics):
+    with _lock:
+        _samples[name].append(sample)
+        slowest = _slowest.get(name)
+        if metrics.slowest_sql and (
+                slowest is None or metrics.slowest_time > slowest[0]):
+            _slowest[name] = (
+                metrics.slowest_time,
+                metrics.slowest_sql[:SLOWEST_SQL_LENGTH])
+
+
+def percentile(values, percent):
+    """Перцентиль по ближайшему рангу."""
+    index = max(0, -(-len(values) * percent // 100) - 1)
+    return values[index]
+
+
+def get_stats():
+    with _lock:
+        samples = {name: list(values) for name, values in _samples.items()}
+        slowest = dict(_slowest)
+    stats = {}
+    for name, values in sorted(samples.items()):
+        stats[name] = {'count': len(values)}
+        for field in FIELDS:
+            ordered = sorted(sample[field] for sample in values)
+            stats[name][field] = {
+                f'p{percent}': round(percentile(ordered, percent), 2)
+                for percent in PERCENTILES
+            }
+        if name in slowest:
+            duration, sql = slowest[name]
+            stats[name]['slowest_sql'] = {
+                'ms': round(duration * 1000, 2), 'sql': sql}
+    return stats
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _slowest.clear()
+
+
+class MetricsMiddleware:
+    """Включается настройкой API_METRICS."""
+
+    def __init__(self, get_response):
+        if not settings.API_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        # Тело потокового ответа формируется уже после выхода из
+        # middleware, его время и запросы сюда не попадают.
+        sample = metrics.as_sample()
+        response['Server-Timing'] = server_timing(sample, metrics)
+        record(metrics.view_name, sample, metrics)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.view_name = view_name(request, view_func)
+
+    def process_template_response(self, request, response):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.render_start = time.perf_counter()
+            response.add_post_render_callback(self.rendered(metrics))
+        return response
+
+    @staticmethod
+    def rendered(metrics):
+        def callback(response):
+            metrics.serialize_time += (
+                time.perf_counter() - metrics.render_start)
+        return callback
@@ -1,9 +1,226 @@
-from rest_framework import filters, mixins, viewsets
+import hashlib
+from datetime import datetime, time
 
+from django.conf import settings
+from django.http import Http404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import filters, mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from . import cache, metrics
 from .permissions import IsAdminOrReadOnly, IsAnonymous
+from .planning import plan_queryset
+from .signals import INVALIDATES
+
+
+class PlannedQuerysetMixin:
+    """Добавляет в queryset JOIN и префетчи, нужные сериализатору."""
+
+    def plan_queryset(self, queryset):
+        return plan_queryset(queryset, self.get_serializer_class())
+
+    def get_queryset(self):
+        return self.plan_queryset(super().get_queryset())
+
+
+class ParentObjectMixin:
+    """Родитель вложенного ресурса (произведение, отзыв) раз за запрос.
+
+    parent_lookup_kwargs связывает поля parent_model с kwargs URL,
+    parent_field — внешний ключ дочерней модели на родителя. Списки и
+    объекты фильтруются по id родителя из URL; сам родитель проверяется
+    одним запросом, который заодно читает его счётчик дочерних объектов
+    parent_count_field, а загружается только когда нужен (создание,
+    сериализатор) и затем переиспользуется.
+    """
+    parent_model = None
+    parent_lookup_kwargs = {}
+    parent_field = None
+    parent_count_field = None
+
+    def get_parent_filter(self):
+        return {
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookup_kwargs.items()
+        }
+
+    def get_parent(self):
+        if getattr(self, '_parent', None) is None:
+            self._parent = get_object_or_404(
+                self.parent_model, **self.get_parent_filter())
+        return self._parent
+
+    def check_parent(self):
+        if getattr(self, '_parent_checked', False):
+            return
+        parent = getattr(self, '_parent', None)
+        if parent is not None:
+            self._parent_count = getattr(
+                parent, self.parent_count_field or 'pk')
+        else:
+            counts = list(self.parent_model.objects.filter(
+                **self.get_parent_filter()
+            ).values_list(self.parent_count_field or 'pk', flat=True)[:1])
+            if not counts:
+                raise Http404
+            self._parent_count = counts[0]
+        self._parent_checked = True
+
+    def get_count_estimate(self):
+        """Число объектов списка по счётчику родителя, без COUNT(*)."""
+        if self.parent_count_field is None:
+            return None
+        self.check_parent()
+        return self._parent_count
+
+    def get_queryset(self):
+        self.check_parent()
+        parent_id = self.kwargs.get(self.parent_lookup_kwargs['pk'])
+        return super().get_queryset().filter(
+            **{f'{self.parent_field}_id': parent_id})
+
+
+class ReadResponseMixin:
+    """Условные GET и кэш ответов на чтение.
+
+    ETag и Last-Modified строятся по версии пространства cache_namespace,
+    поэтому совпавший If-None-Match отдаёт 304 без запросов к БД и без
+    сериализации. При cache_responses тело успешного ответа сохраняется
+    в кэше до следующей записи в пространство.
+    """
+    cache_namespace = None
+    cache_responses = False
+
+    def get_cache_day(self, request):
+        """День, от которого зависит ответ помимо данных, или None."""
+        return None
+
+    def get_cache_url(self, request):
+        url = request.build_absolute_uri()
+        day = self.get_cache_day(request)
+        return url if day is None else f'{url}#{day.isoformat()}'
 
+    def get_validators(self, request):
+        version = cache.get_version(self.cache_namespace)
+        digest = hashlib.md5(':'.join((
+            str(version),
+            str(request.user.pk or ''),
+            request.accepted_media_type,
+            self.get_cache_url(request),
+        )).encode()).hexdigest()
+        last_modified = version // 10 ** 6
+        day = self.get_cache_day(request)
+        if day is not None:
+            # Ответ меняется в полночь даже без записей.
+            midnight = timezone.make_aware(datetime.combine(day, time.min))
+            last_modified = max(last_modified, int(midnight.timestamp()))
+        return f'"{digest}"', last_modified
 
-class CreateListDestroyMixinSet(mixins.CreateModelMixin,
+    def read_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            if self.cache_responses:
+                response = self.cached_response(
+                    handler, request, *args, **kwargs)
+            else:
+                response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = cache.response_key(
+            self.cache_namespace, self.get_cache_url(request))
+        data = cache.get_response(key)
+        if data is not None:
+            cache.record(self.cache_namespace, hit=True)
+            return Response(data, headers={'X-Cache': 'HIT'})
+        cache.record(self.cache_namespace, hit=False)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set_response(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ReadListMixin(ReadResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.read_response(super().list, request, *args, **kwargs)
+
+
+class ReadRetrieveMixin(ReadResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.read_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class FastReadMixin:
+    """Список через fast_rows_class вместо сериализатора.
+
+    Путь включается для представлений, перечисленных в настройке
+    API_FAST_READ, чтобы оба варианта можно было сравнить на одном API.
+    """
+    fast_rows_class = None
+
+    def use_fast_read(self):
+        return type(self).__name__ in settings.API_FAST_READ
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_read():
+            return super().list(request, *args, **kwargs)
+        rows = self.fast_rows_class()
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        with metrics.serializing():
+            data = rows.to_representation(
+                list(queryset if page is None else page))
+        if page is None:
+            response = Response(data)
+        else:
+            response = self.get_paginated_response(data)
+        response.fast_json = True
+        return response
+
+
+class BulkCreateMixin:
+    """POST .../bulk/ — создание списка объектов одним запросом.
+
+    bulk_serializer_class проверяет и создаёт пачку, ответ строится
+    обычным сериализатором представления. bulk_create не отправляет
+    post_save, поэтому версия пространства кэша сдвигается здесь
+    (после фиксации транзакции).
+    """
+    bulk_serializer_class = None
+
+    def get_bulk_context(self):
+        return {}
+
+    @action(methods=['post'], detail=False, url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        serializer = self.bulk_serializer_class(
+            data=request.data, many=True, allow_empty=False,
+            context={**self.get_serializer_context(),
+                     **self.get_bulk_context()}
+        )
+        serializer.is_valid(raise_exception=True)
+        objects = serializer.save()
+        cache.bump_version_on_commit(
+            *INVALIDATES[self.bulk_serializer_class.Meta.model])
+        return Response(
+            self.get_serializer(objects, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class CreateListDestroyMixinSet(ReadListMixin,
+                                mixins.CreateModelMixin,
                                 mixins.ListModelMixin,
                                 mixins.DestroyModelMixin,
                                 viewsets.GenericViewSet):
@@ -11,3 +228,13 @@ class CreateListDestroyMixinSet(mixins.CreateModelMixin,
     filter_backends = [filters.SearchFilter]
     search_fields = ['name']
     lookup_field = 'slug'
+    cache_responses = True
+    title_count_query_param = 'title_count'
+    title_count_serializer_class = None
+
+    def get_serializer_class(self):
+        # Счётчик произведений отдаётся по запросу ?title_count=true.
+        if (self.action == 'list' and self.request.query_params.get(
+                self.title_count_query_param) in ('true', '1')):
+            return self.title_count_serializer_class
+        return super().get_serializer_class()
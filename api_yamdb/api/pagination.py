@@ -0,0 +1,186 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import (EmptyPage, InvalidPage, PageNotAnInteger,
+                                   Paginator)
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, CursorPagination,
+                                       PageNumberPagination)
+from rest_framework.response import Response
+
+EXACT = 'exact'
+ESTIMATE = 'estimate'
+NONE = 'none'
+COUNT_MODES = (EXACT, ESTIMATE, NONE)
+
+
+class EstimatedPaginator(Paginator):
+    """Paginator с заранее известным числом объектов вместо COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count = count
+
+
+class UncountedPaginator(Paginator):
+    """Paginator без COUNT(*).
+
+    Страница читается с одной лишней строкой: по ней видно, есть ли
+    следующая. num_pages — число страниц, известных после чтения.
+    """
+    known_pages = 1
+
+    @property
+    def num_pages(self):
+        return self.known_pages
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        self.known_pages = number + (len(rows) > self.per_page)
+        return self._get_page(rows[:self.per_page], number, self)
+
+
+class SizedPagination(PageNumberPagination):
+    """Размер страницы из ``?page_size=`` с верхней границей.
+
+    ``?count=`` выбирает, как считать объекты: exact — COUNT(*),
+    estimate — get_count_estimate() представления (поддерживаемые
+    счётчики), none — ключ count не отдаётся и COUNT(*) не выполняется.
+    Если у представления нет оценки, estimate считает точно.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    count_query_param = 'count'
+    count_mode = EXACT
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param)
+        return mode if mode in COUNT_MODES else self.count_mode
+
+    def get_paginator(self, queryset, page_size, view):
+        if self.count_mode == NONE:
+            return UncountedPaginator(queryset, page_size)
+        if self.count_mode == ESTIMATE:
+            estimate = getattr(view, 'get_count_estimate', None)
+            count = None if estimate is None else estimate()
+            if count is not None:
+                return EstimatedPaginator(queryset, page_size, count)
+        return self.django_paginator_class(queryset, page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        self.count_mode = self.get_count_mode(request)
+        paginator = self.get_paginator(queryset, page_size, view)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)))
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return list(self.page)
+
+    def get_page_number(self, request, paginator):
+        page_number = request.query_params.get(self.page_query_param, 1)
+        if (page_number in self.last_page_strings
+                and self.count_mode != NONE):
+            page_number = paginator.num_pages
+        return page_number
+
+    def get_paginated_response(self, data):
+        if self.count_mode != NONE:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+
+class EstimatedCountPagination(SizedPagination):
+    """По умолчанию count берётся из счётчиков, без COUNT(*)."""
+    count_mode = ESTIMATE
+
+
+class SizedCursorPagination(CursorPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+class PubDateCursorPagination(SizedCursorPagination):
+    """Курсор по индексированному pub_date с id для равных дат."""
+    ordering = ('pub_date', 'id')
+
+
+class TitleCursorPagination(SizedCursorPagination):
+    ordering = '-id'
+
+
+class SwitchablePagination(BasePagination):
+    """Постраничная пагинация с переключением в курсорный режим.
+
+    Курсорный режим включается параметром ``?pagination=cursor``
+    (ссылки next/previous сохраняют его) и не выполняет COUNT(*)
+    и OFFSET-сканирование на глубоких страницах.
+    """
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+    page_pagination_class = SizedPagination
+    cursor_pagination_class = None
+
+    def __init__(self):
+        self.paginator = self.page_pagination_class()
+
+    def __getattr__(self, name):
+        if name == 'paginator':
+            raise AttributeError(name)
+        return getattr(self.paginator, name)
+
+    def is_cursor_mode(self, request):
+        return (
+            request.query_params.get(self.mode_query_param)
+            == self.cursor_mode
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_mode(request):
+            self.paginator = self.cursor_pagination_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+
+class TitlePagination(SwitchablePagination):
+    cursor_pagination_class = TitleCursorPagination
+
+
+class PubDatePagination(SwitchablePagination):
+    cursor_pagination_class = PubDateCursorPagination
+
+
+class CommentPagination(PubDatePagination):
+    page_pagination_class = EstimatedCountPagination
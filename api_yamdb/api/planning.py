@@ -0,0 +1,54 @@
+"""Планирование JOIN и префетчей по дереву полей сериализатора.
+
+Для каждого сериализатора один раз вычисляются пути для
+select_related (прямые связи «к одному») и prefetch_related
+(связи «ко многим» и всё, что лежит под ними), чтобы страница
+списка обходилась фиксированным числом запросов.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+@lru_cache(maxsize=None)
+def related_paths(serializer_class):
+    """Возвращает пары путей (select_related, prefetch_related)."""
+    select, prefetch = [], []
+    _walk(serializer_class(), '', False, select, prefetch)
+    return tuple(select), tuple(prefetch)
+
+
+def plan_queryset(queryset, serializer_class):
+    select, prefetch = related_paths(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _walk(serializer, prefix, under_prefetch, select, prefetch):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return
+    for field in serializer.fields.values():
+        if field.source == '*' or not field.source_attrs:
+            continue
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+        path = prefix + model_field.name
+        to_many = model_field.many_to_many or model_field.one_to_many
+        if to_many or under_prefetch:
+            prefetch.append(path)
+        else:
+            select.append(path)
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.BaseSerializer):
+            _walk(field, path + '__', to_many or under_prefetch,
+                  select, prefetch)
@@ -0,0 +1,32 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer, который кодирует ответы быстрого пути через orjson.
+
+    orjson используется только для ответов с fast_json = True: их данные
+    состоят из строк, целых чисел, None, списков и словарей, и вывод
+    совпадает с JSONRenderer. Остальные ответы и запросы с отступами
+    рендерятся как обычно; без orjson рендерер ничем не отличается от
+    JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        response = renderer_context.get('response')
+        if (orjson is None or data is None
+                or not getattr(response, 'fast_json', False)
+                or not api_settings.COMPACT_JSON
+                or not api_settings.UNICODE_JSON
+                or self.get_indent(accepted_media_type, renderer_context)):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+        # Как JSONRenderer: U+2028 и U+2029 экранируются для JavaScript.
+        return orjson.dumps(data).replace(
+            b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -1,24 +1,42 @@
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
+from reviews import bulk, leaderboard
 from reviews.models import (Category, Comment, Genre, Review,
                             Title, User)
 
+from .metrics import TimedSerializerMixin
 
-class CategorySerializer(serializers.ModelSerializer):
+MAX_BATCH_IDS = 300
+MAX_BULK_ITEMS = 500
+DEFAULT_TOP_LIMIT = 10
+MAX_TOP_LIMIT = 100
+MAX_TOP_WINDOW_DAYS = 365
+
+
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['name', 'slug']
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ['name', 'slug']
 
 
-class TitleSerializer(serializers.ModelSerializer):
+class CategoryTitleCountSerializer(CategorySerializer):
+    class Meta(CategorySerializer.Meta):
+        fields = ['name', 'slug', 'title_count']
+
+
+class GenreTitleCountSerializer(GenreSerializer):
+    class Meta(GenreSerializer.Meta):
+        fields = ['name', 'slug', 'title_count']
+
+
+class TitleSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     genre = GenreSerializer(read_only=True, many=True)
     category = CategorySerializer(read_only=True)
     rating = serializers.IntegerField(read_only=True)
@@ -26,11 +44,13 @@ class TitleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Title
         fields = [
-            'id', 'name', 'year', 'rating', 'description', 'genre', 'category']
-        read_only_fields = ['id', 'name', 'year', 'description']
+            'id', 'name', 'year', 'rating', 'review_count', 'description',
+            'genre', 'category']
+        read_only_fields = [
+            'id', 'name', 'year', 'review_count', 'description']
 
 
-class TitleCUDSerializer(serializers.ModelSerializer):
+class TitleCUDSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     genre = serializers.SlugRelatedField(
         queryset=Genre.objects.all(), slug_field='slug', many=True)
     category = serializers.SlugRelatedField(
@@ -41,7 +61,35 @@ class TitleCUDSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'year', 'description', 'genre', 'category']
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class TitleBatchSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BATCH_IDS
+    )
+
+
+class TitleTopQuerySerializer(serializers.Serializer):
+    window = serializers.RegexField(r'^(all|[1-9][0-9]*d)$', default='7d')
+    order = serializers.ChoiceField(
+        choices=leaderboard.ORDERS, default=leaderboard.ORDER_RATING)
+    category = serializers.SlugField(required=False)
+    genre = serializers.SlugField(required=False)
+    limit = serializers.IntegerField(
+        min_value=1, max_value=MAX_TOP_LIMIT, default=DEFAULT_TOP_LIMIT)
+
+    def validate_window(self, value):
+        """'7d' — число дней, 'all' — None."""
+        if value == 'all':
+            return None
+        days = int(value[:-1])
+        if days > MAX_TOP_WINDOW_DAYS:
+            raise ValidationError(
+                f'Окно не может быть больше {MAX_TOP_WINDOW_DAYS}d.')
+        return days
+
+
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -56,7 +104,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -73,18 +121,112 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         request = self.context['request']
-        author = request.user
-        title_id = self.context['view'].kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
         if request.method == 'POST':
-            if Review.objects.filter(title=title, author=author).exists():
+            title = self.context['view'].get_parent()
+            if Review.objects.filter(
+                    title=title, author=request.user).exists():
                 raise ValidationError(
                     'Вы не можете повторно подписаться на автора'
                 )
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class BulkListSerializer(serializers.ListSerializer):
+    """Проверка пачки объектов постоянным числом запросов.
+
+    Авторы по username загружаются одним запросом; указать чужого
+    автора могут только администратор и модератор.
+    """
+
+    def to_internal_value(self, data):
+        # Ошибки отдельных объектов возвращаются списком по позициям,
+        # поэтому проверка пачки идёт здесь, а не в validate().
+        if isinstance(data, list) and len(data) > MAX_BULK_ITEMS:
+            raise ValidationError(
+                f'Не больше {MAX_BULK_ITEMS} объектов за запрос.')
+        attrs = super().to_internal_value(data)
+        user = self.context['request'].user
+        names = {
+            item['author'] for item in attrs if 'author' in item
+        } - {user.username}
+        if names and not (user.is_admin or user.is_moderator):
+            raise PermissionDenied(
+                'Указать автора могут только администратор и модератор.')
+        authors = {user.username: user}
+        authors.update(
+            (author.username, author) for author in
+            User.objects.filter(username__in=names).only('id', 'username')
+        )
+        errors = []
+        for item in attrs:
+            name = item.get('author', user.username)
+            item['author'] = authors.get(name)
+            errors.append(
+                {} if item['author'] else
+                {'author': [f'Пользователь {name} не найден.']})
+        self.validate_items(attrs, errors)
+        if any(errors):
+            raise ValidationError(errors)
+        return attrs
+
+    def validate_items(self, attrs, errors):
+        pass
+
+
+class ReviewBulkListSerializer(BulkListSerializer):
+
+    def validate_items(self, attrs, errors):
+        title = self.context['title']
+        existing = set(Review.objects.filter(
+            title=title,
+            author__in=[item['author'].pk for item in attrs
+                        if item['author']]
+        ).values_list('author_id', flat=True))
+        for item, item_errors in zip(attrs, errors):
+            author = item['author']
+            if author is None:
+                continue
+            if author.pk in existing:
+                item_errors['author'] = [
+                    f'Отзыв {author.username} на это произведение '
+                    f'уже есть.']
+            existing.add(author.pk)
+
+    def create(self, validated_data):
+        return bulk.create_reviews([
+            Review(title=self.context['title'], **item)
+            for item in validated_data
+        ])
+
+
+class ReviewBulkSerializer(serializers.ModelSerializer):
+    author = serializers.CharField(required=False)
+
+    class Meta:
+        model = Review
+        fields = ('author', 'text', 'score')
+        list_serializer_class = ReviewBulkListSerializer
+
+
+class CommentBulkListSerializer(BulkListSerializer):
+
+    def create(self, validated_data):
+        return bulk.create_comments([
+            Comment(review=self.context['review'], **item)
+            for item in validated_data
+        ])
+
+
+class CommentBulkSerializer(serializers.ModelSerializer):
+    author = serializers.CharField(required=False)
+
+    class Meta:
+        model = Comment
+        fields = ('author', 'text')
+        list_serializer_class = CommentBulkListSerializer
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
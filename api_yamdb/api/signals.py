@@ -0,0 +1,77 @@
+from django.db.models.signals import (m2m_changed, post_delete,
+                                      post_migrate, post_save)
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, User)
+
+from . import autocomplete, cache
+from .authentication import set_token_version
+
+# Какие пространства кэша и ETag зависят от каждой модели.
+INVALIDATES = {
+    Category: ('categories', 'titles'),
+    Genre: ('genres', 'titles'),
+    Title: ('titles', 'reviews', 'categories', 'genres'),
+    TitleGenre: ('titles', 'genres'),
+    Review: ('titles', 'reviews', 'comments'),
+    Comment: ('comments', 'reviews'),
+    User: ('users',),
+}
+# Ответы отзывов и комментариев показывают из пользователя только имя.
+USERNAME_INVALIDATES = ('reviews', 'comments')
+
+
+def model_changed(sender, **kwargs):
+    cache.bump_version_on_commit(*INVALIDATES[sender])
+
+
+def autocomplete_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        autocomplete.MODEL_INDEXES[sender].update(instance, created)
+
+
+def autocomplete_deleted(sender, instance, **kwargs):
+    autocomplete.MODEL_INDEXES[sender].delete(instance.pk)
+
+
+# Приёмники без sender отключили бы быстрое удаление у всех моделей.
+for model in INVALIDATES:
+    post_save.connect(model_changed, sender=model)
+    post_delete.connect(model_changed, sender=model)
+for model in autocomplete.MODEL_INDEXES:
+    post_save.connect(autocomplete_saved, sender=model)
+    post_delete.connect(autocomplete_deleted, sender=model)
+
+
+def username_changed(instance, created):
+    if created:
+        return False
+    loaded = getattr(instance, '_loaded_claims', None)
+    return loaded is None or loaded['username'] != instance.username
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    set_token_version(
+        instance.pk, instance.token_version if instance.is_active else None)
+    if username_changed(instance, created):
+        cache.bump_version_on_commit(*USERNAME_INVALIDATES)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    set_token_version(instance.pk, None)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        cache.bump_version_on_commit(*INVALIDATES[TitleGenre])
+
+
+@receiver(post_migrate)
+def schema_changed(sender, **kwargs):
+    cache.bump_version(*set().union(*INVALIDATES.values()))
+    for index in autocomplete.INDEXES.values():
+        index.reset()
@@ -4,7 +4,8 @@ from rest_framework.routers import DefaultRouter
 from .views import (CategoryViewSet, CommentViewSet,
                     GenreViewSet, ReviewViewSet,
                     TitleViewSet, UserViewSet,
-                    create_user, get_token)
+                    autocomplete_search, cache_stats, create_user,
+                    export_data, get_token, metrics_stats)
 
 app_name = 'api'
 
@@ -21,5 +22,10 @@ router_v1.register(r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)'
 urlpatterns = [
     path('v1/auth/signup/', create_user, name='registration'),
     path('v1/auth/token/', get_token, name='get_token'),
+    path('v1/_cache/', cache_stats, name='cache_stats'),
+    path('v1/_metrics/', metrics_stats, name='metrics_stats'),
+    path('v1/export/<str:table>/', export_data, name='export_data'),
+    path('v1/autocomplete/<str:kind>/', autocomplete_search,
+         name='autocomplete'),
     path('v1/', include(router_v1.urls)),
 ]
@@ -1,93 +1,222 @@
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.generics import get_object_or_404
-from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import (Category, Genre, Review,
-                            Title, User)
+from reviews import leaderboard, outbox
+from reviews.csv_export import EXPORTS, FORMATS, export_lines
+from reviews.models import (SCORE_FIELDS, Category, Comment, Genre,
+                            Review, Title, User)
 from uuid import uuid4
 
 
-from .filters import TitleFilter
-from .mixins import CreateListDestroyMixinSet
+from .filters import TitleFilter, TitleSearchFilter
+from . import autocomplete, cache, metrics
+from .authentication import access_token_for, get_db_user
+from .fast import CommentRows, ReviewRows, TitleRows
+from .mixins import (BulkCreateMixin, CreateListDestroyMixinSet,
+                     FastReadMixin, ParentObjectMixin, PlannedQuerysetMixin,
+                     ReadListMixin, ReadRetrieveMixin)
+from .pagination import (CommentPagination, PubDatePagination,
+                         SizedPagination, TitlePagination)
 from .permissions import IsAdminOrReadOnly, IsAdminModeratorAuthorOrReadOnly
 from .permissions import IsAnonymous
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, GetCodeSerializer,
-                          GetTokenSerializer, ReviewSerializer,
-                          TitleCUDSerializer, TitleSerializer,
+from .serializers import (CategorySerializer, CategoryTitleCountSerializer,
+                          CommentBulkSerializer, CommentSerializer,
+                          GenreSerializer, GenreTitleCountSerializer,
+                          GetCodeSerializer, GetTokenSerializer,
+                          ReviewBulkSerializer, ReviewSerializer,
+                          TitleBatchSerializer, TitleCUDSerializer,
+                          TitleSerializer, TitleTopQuerySerializer,
                           UserSerializer)
 
 
 class CategoryViewSet(CreateListDestroyMixinSet):
     queryset = Category.objects.all().order_by('name')
     serializer_class = CategorySerializer
+    title_count_serializer_class = CategoryTitleCountSerializer
+    cache_namespace = 'categories'
 
 
 class GenreViewSet(CreateListDestroyMixinSet):
     queryset = Genre.objects.all().order_by('name')
     serializer_class = GenreSerializer
+    title_count_serializer_class = GenreTitleCountSerializer
+    cache_namespace = 'genres'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ReadListMixin, ReadRetrieveMixin, FastReadMixin,
+                   PlannedQuerysetMixin, viewsets.ModelViewSet):
     permission_classes = [IsAnonymous | IsAdminOrReadOnly]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, TitleSearchFilter]
     filterset_class = TitleFilter
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).all().order_by('-id')
+    pagination_class = TitlePagination
+    fast_rows_class = TitleRows
+    cache_namespace = 'titles'
+    cache_responses = True
+    queryset = Title.objects.all().order_by('-id')
 
     def get_serializer_class(self):
-        if self.request.method in ['POST', 'PATCH']:
+        if (self.request.method in ['POST', 'PATCH']
+                and self.action != 'batch'):
             return TitleCUDSerializer
         return TitleSerializer
 
+    @action(methods=['get', 'post'], detail=False, url_path='batch',
+            permission_classes=[AllowAny])
+    def batch(self, request):
+        """Несколько произведений за постоянное число запросов.
 
-class ReviewViewSet(viewsets.ModelViewSet):
+        Id передаются как ?ids=1,2,3 или в теле POST {"ids": [1, 2, 3]};
+        результаты идут в порядке запроса, ненайденные id — в missing.
+        """
+        if request.method == 'POST':
+            return self.batch_lookup(request)
+        return self.read_response(self.batch_lookup, request)
+
+    def batch_lookup(self, request):
+        if request.method == 'POST':
+            data = request.data
+        else:
+            data = {'ids': [
+                value for value in
+                request.query_params.get('ids', '').split(',') if value
+            ]}
+        serializer = TitleBatchSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        titles = {
+            title.pk: title for title in
+            self.plan_queryset(Title.objects.filter(pk__in=ids))
+        }
+        found = [titles[pk] for pk in ids if pk in titles]
+        return Response({
+            'results': self.get_serializer(found, many=True).data,
+            'missing': [pk for pk in ids if pk not in titles],
+        }, status=status.HTTP_200_OK)
+
+    def get_cache_day(self, request):
+        # Окно рейтинга отсчитывается от сегодняшнего дня.
+        if (self.action == 'top'
+                and request.query_params.get('window') != 'all'):
+            return timezone.localdate()
+        return None
+
+    @action(methods=['get'], detail=False, url_path='top')
+    def top(self, request):
+        """Лучшие произведения за период.
+
+        ?window=7d (число дней или all), ?order=rating или reviews,
+        ?genre=, ?category=, ?limit=. Строится по статистике отзывов
+        по дням, без агрегации по таблице отзывов.
+        """
+        return self.read_response(self.top_titles, request)
+
+    def top_titles(self, request):
+        serializer = TitleTopQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        rows = leaderboard.top_titles(
+            days=query['window'], order=query['order'],
+            category=query.get('category'), genre=query.get('genre'),
+            limit=query['limit'])
+        titles = {
+            title.pk: title for title in self.plan_queryset(
+                Title.objects.filter(pk__in=[row[0] for row in rows]))
+        }
+        rows = [row for row in rows if row[0] in titles]
+        data = self.get_serializer(
+            [titles[pk] for pk, _, _ in rows], many=True).data
+        return Response({
+            'window': 'all' if query['window'] is None
+            else f'{query["window"]}d',
+            'order': query['order'],
+            'results': [
+                {**title, 'window_review_count': reviews,
+                 'window_rating': round(rating, 2)}
+                for title, (_, reviews, rating) in zip(data, rows)
+            ],
+        }, status=status.HTTP_200_OK)
+
+    @action(methods=['get'], detail=True, url_path='rating')
+    def rating(self, request, pk=None):
+        """Средняя оценка и гистограмма оценок 0–10 из счётчиков"""
+        return self.read_response(self.rating_distribution, request, pk=pk)
+
+    def rating_distribution(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.values(
+                'id', 'rating', 'review_count', *SCORE_FIELDS.values()),
+            pk=pk
+        )
+        return Response({
+            'id': title['id'],
+            'rating': title['rating'],
+            'review_count': title['review_count'],
+            'scores': {
+                score: title[field] for score, field in SCORE_FIELDS.items()
+            },
+        }, status=status.HTTP_200_OK)
+
+
+class ReviewViewSet(ReadListMixin, ReadRetrieveMixin, FastReadMixin,
+                    BulkCreateMixin, ParentObjectMixin, PlannedQuerysetMixin,
+                    viewsets.ModelViewSet):
     permission_classes = [IsAdminModeratorAuthorOrReadOnly]
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
+    bulk_serializer_class = ReviewBulkSerializer
+    fast_rows_class = ReviewRows
+    pagination_class = PubDatePagination
+    cache_namespace = 'reviews'
+    parent_model = Title
+    parent_lookup_kwargs = {'pk': 'title_id'}
+    parent_field = 'title'
+    parent_count_field = 'review_count'
 
-    def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        title = get_object_or_404(Title, id=title_id)
-        serializer.save(author=self.request.user, title=title)
+    def get_bulk_context(self):
+        return {'title': self.get_parent()}
 
-    def get_queryset(self):
-        title = get_object_or_404(Title, pk=self.kwargs.get('title_id'))
-        return title.reviews.all()
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, title=self.get_parent())
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReadListMixin, ReadRetrieveMixin, FastReadMixin,
+                     BulkCreateMixin, ParentObjectMixin, PlannedQuerysetMixin,
+                     viewsets.ModelViewSet):
     permission_classes = [IsAdminModeratorAuthorOrReadOnly]
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    bulk_serializer_class = CommentBulkSerializer
+    fast_rows_class = CommentRows
+    pagination_class = CommentPagination
+    cache_namespace = 'comments'
+    parent_model = Review
+    parent_lookup_kwargs = {'pk': 'review_id', 'title_id': 'title_id'}
+    parent_field = 'review'
+    parent_count_field = 'comment_count'
 
-    def perform_create(self, serializer):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        serializer.save(author=self.request.user, review=review)
+    def get_bulk_context(self):
+        return {'review': self.get_parent()}
 
-    def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        review_id = self.kwargs.get('review_id')
-        review = get_object_or_404(Review, id=review_id, title=title_id)
-        return review.comments.all()
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReadListMixin, ReadRetrieveMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
-    pagination_class = PageNumberPagination
+    pagination_class = SizedPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = [IsAdminOrReadOnly]
     lookup_field = 'username'
     last_login = None
+    cache_namespace = 'users'
 
     @action(
         methods=['get', 'patch'],
@@ -97,17 +226,72 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer_class=UserSerializer,
     )
     def me(self, request):
+        user = get_db_user(request.user)
         if request.method == 'PATCH':
             serializer = UserSerializer(
-                request.user, data=request.data, partial=True
+                user, data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def cache_stats(request):
+    """Счётчики попаданий и промахов кэша ответов"""
+    return Response(cache.get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def metrics_stats(request):
+    """Перцентили числа запросов и задержек по эндпоинтам"""
+    return Response(metrics.get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def autocomplete_search(request, kind):
+    """Подсказки по началу или части названия"""
+    index = autocomplete.INDEXES.get(kind)
+    if index is None:
+        return Response(
+            {'detail': f'Доступно: {", ".join(autocomplete.INDEXES)}.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    if kind == 'users' and not IsAdminOrReadOnly().has_permission(
+            request, None):
+        return Response(status=status.HTTP_403_FORBIDDEN)
+    try:
+        limit = min(int(request.query_params.get(
+            'limit', autocomplete.DEFAULT_LIMIT)), autocomplete.MAX_LIMIT)
+    except ValueError:
+        limit = autocomplete.DEFAULT_LIMIT
+    results = index.search(request.query_params.get('q', ''), max(limit, 1))
+    return Response({'results': results}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminOrReadOnly])
+def export_data(request, table):
+    """Потоковая выгрузка отзывов или комментариев"""
+    output = request.query_params.get('output', 'csv')
+    if table not in EXPORTS or output not in FORMATS:
+        return Response(
+            {'detail': f'Доступные таблицы: {", ".join(EXPORTS)}; '
+                       f'форматы: {", ".join(FORMATS)}.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    response = StreamingHttpResponse(
+        export_lines(table, output), content_type=FORMATS[output])
+    response['Content-Disposition'] = (
+        f'attachment; filename="{table}.{output}"')
+    return response
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def create_user(request):
@@ -130,7 +314,7 @@ def create_user(request):
     user.save()
     subject = 'Регистрация на YAMDB'
     message = f'Код подтверждения: {user.confirmation_code}'
-    send_mail(subject, message, 'YAMDB', [user.email])
+    outbox.enqueue(subject, message, 'YAMDB', [user.email])
     return Response(
         serializer.data,
         status=status.HTTP_200_OK
@@ -147,9 +331,9 @@ def get_token(request):
     confirmation_code = serializer.validated_data.get('confirmation_code')
     user = get_object_or_404(User, username=username)
     if confirmation_code == user.confirmation_code:
-        token = AccessToken.for_user(user)
         user.is_active = True
         user.save()
+        token = access_token_for(user)
         return Response({'token': f'{token}'}, status=status.HTTP_200_OK)
     return Response({'confirmation_code': 'Неверный код подтверждения'},
                     status=status.HTTP_400_BAD_REQUEST)
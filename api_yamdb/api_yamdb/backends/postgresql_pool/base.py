@@ -0,0 +1,87 @@
+"""PostgreSQL с пулом соединений psycopg2 в каждом процессе.
+
+Соединение берётся из ThreadedConnectionPool при открытии и
+возвращается в пул при закрытии, поэтому его удобно сочетать
+с CONN_MAX_AGE = 0: Django закрывает соединение в конце запроса,
+а физическое соединение с сервером остаётся открытым.
+Размер пула — OPTIONS['pool_min_size'] и OPTIONS['pool_max_size'].
+Потоков с открытым соединением не может быть больше pool_max_size:
+остальные ждут освободившееся соединение до OPTIONS['pool_timeout']
+секунд и затем получают OperationalError.
+"""
+import time
+from threading import Condition, Lock
+
+from django.db import OperationalError
+from django.db.backends.postgresql import base
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+POOL_OPTIONS = {'pool_min_size': 1, 'pool_max_size': 10, 'pool_timeout': 30}
+RETRY_INTERVAL = 0.05
+
+_pools = {}
+_pools_lock = Lock()
+# Сигнал о соединении, возвращённом в любой из пулов.
+_released = Condition()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for option in POOL_OPTIONS:
+            params.pop(option, None)
+        return params
+
+    def get_pool(self, conn_params):
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                options = {**POOL_OPTIONS, **self.settings_dict['OPTIONS']}
+                pool = ThreadedConnectionPool(
+                    options['pool_min_size'], options['pool_max_size'],
+                    **conn_params)
+                _pools[self.alias] = pool
+        return pool
+
+    def get_pooled_connection(self, pool):
+        """getconn() не ждёт: при исчерпанном пуле он сразу падает."""
+        timeout = {**POOL_OPTIONS, **self.settings_dict['OPTIONS']}[
+            'pool_timeout']
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return pool.getconn()
+            except PoolError as error:
+                remaining = deadline - time.monotonic()
+                if pool.closed or remaining <= 0:
+                    raise OperationalError(
+                        f'Нет свободных соединений в пуле за '
+                        f'{timeout} с: {error}') from error
+            # Короткое ожидание: возврат соединения между getconn()
+            # и wait() иначе был бы пропущен.
+            with _released:
+                _released.wait(min(remaining, RETRY_INTERVAL))
+
+    def get_new_connection(self, conn_params):
+        connection = self.get_pooled_connection(self.get_pool(conn_params))
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            # Незавершённую транзакцию пул откатывает сам, разорванное
+            # соединение закрывает вместо возврата.
+            _pools[self.alias].putconn(
+                self.connection, close=bool(self.connection.closed))
+        with _released:
+            _released.notify_all()
@@ -0,0 +1,29 @@
+"""SQLite для нескольких процессов-воркеров.
+
+OPTIONS['pragmas'] выполняются на каждом новом соединении (WAL,
+synchronous, busy_timeout, mmap_size). OPTIONS['transaction_mode']
+задаёт вид BEGIN: при IMMEDIATE транзакция сразу берёт блокировку
+записи и ждёт её busy_timeout, вместо ошибки «database is locked» при
+попытке повысить блокировку чтения посреди транзакции.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pragmas', None)
+        params.pop('transaction_mode', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict['OPTIONS'].get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
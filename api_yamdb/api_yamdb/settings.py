@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -62,12 +63,58 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
+# DB_ENGINE: api_yamdb.backends.sqlite3 (по умолчанию),
+# django.db.backends.postgresql или api_yamdb.backends.postgresql_pool
+DB_ENGINE = os.getenv('DB_ENGINE', 'api_yamdb.backends.sqlite3')
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'ENGINE': DB_ENGINE,
+        'NAME': os.getenv('DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')),
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', 60)),
     }
 }
+if DB_ENGINE == 'api_yamdb.backends.sqlite3':
+    # Параметры понимает только свой бэкенд, а не стандартный sqlite3.
+    DATABASES['default']['OPTIONS'] = {
+        'transaction_mode': os.getenv('SQLITE_TRANSACTION_MODE', 'IMMEDIATE'),
+        'pragmas': {
+            'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+            'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+            'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+            'temp_store': 'MEMORY',
+        },
+    }
+elif not DB_ENGINE.endswith('sqlite3'):
+    DATABASES['default'].update({
+        'USER': os.getenv('POSTGRES_USER'),
+        'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+    })
+    if DB_ENGINE == 'api_yamdb.backends.postgresql_pool':
+        # Соединения живут в пуле, Django возвращает их после запроса.
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS'] = {
+            'pool_min_size': int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+            'pool_max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        }
+
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
+    }
+}
+
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = int(os.getenv('API_CACHE_TIMEOUT', 300))
+# Сколько живёт версия пространства кэша, по которой строятся ETag
+API_CACHE_VERSION_TIMEOUT = int(
+    os.getenv('API_CACHE_VERSION_TIMEOUT', API_CACHE_TIMEOUT))
 
 # # Password validation
 # AUTH_PASSWORD_VALIDATORS = [
@@ -120,11 +167,14 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS':
-        'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.SizedPagination',
     'PAGE_SIZE': 5,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.RoleClaimsJWTAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
 }
 
@@ -133,6 +183,24 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Роль и флаги пользователя в AccessToken (см. api/authentication.py)
+JWT_ROLE_CLAIMS = os.getenv('JWT_ROLE_CLAIMS', 'True') == 'True'
+JWT_TOKEN_VERSION_TTL = int(os.getenv('JWT_TOKEN_VERSION_TTL', 60))
+
+# Представления, чьи списки строятся из .values() (см. api/fast.py)
+API_FAST_READ = [
+    name for name in os.getenv(
+        'API_FAST_READ', 'TitleViewSet,ReviewViewSet,CommentViewSet'
+    ).split(',') if name
+]
+
+# Наибольший размер страницы, который можно запросить ?page_size=
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
+
+# Число запросов и задержки по эндпоинтам (см. api/metrics.py)
+API_METRICS = os.getenv('API_METRICS', 'False') == 'True'
+API_METRICS_SAMPLES = int(os.getenv('API_METRICS_SAMPLES', 1000))
+
 AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
     'core.custom_authentication.AuthenticationWithoutPassword',
@@ -141,3 +209,5 @@ AUTHENTICATION_BACKENDS = (
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL")
+# after_response | thread | command (см. reviews/outbox.py)
+EMAIL_OUTBOX_DISPATCH = os.getenv('EMAIL_OUTBOX_DISPATCH', 'after_response')
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Category, Genre, Title, User, Review, Comment, TitleGenre
+from . import search
+from .models import (Category, Genre, Title, User, Review, Comment,
+                     TitleGenre, OutboxMessage)
 
 admin.site.site_header = 'Панель администратора YaMDb'
 admin.site.site_title = 'Панель администратора YaMDb'
@@ -17,11 +19,16 @@ class GenreAdmin(admin.ModelAdmin):
 
 
 class TitleAdmin(admin.ModelAdmin):
-    list_display = ('id', 'name', 'year')
+    list_display = ('id', 'name', 'year', 'rating', 'review_count')
     list_filter = ('year', 'genre', 'category')
     search_fields = ('name', 'description')
     empty_value_display = '-пусто-'
 
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and search.is_available():
+            return search.search_titles(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
 
 class UserAdmin(admin.ModelAdmin):
     list_display = (
@@ -65,7 +72,21 @@ class TitleGenreAdmin(admin.ModelAdmin):
     )
 
 
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'recipient',
+        'subject',
+        'created',
+        'sent_at',
+        'attempts'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
+
+
 admin.site.register(TitleGenre, TitleGenreAdmin)
+admin.site.register(OutboxMessage, OutboxMessageAdmin)
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Review, ReviewAdmin)
@@ -0,0 +1,60 @@
+"""Массовое создание отзывов и комментариев.
+
+bulk_create не отправляет сигналы post_save, поэтому счётчики
+произведения, его статистика за день и счётчик отзыва обновляются
+здесь одним UPDATE на всю пачку.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from .counters import apply_comment_delta
+from .leaderboard import apply_daily_delta, review_day
+from .models import Comment, Review
+from .ratings import apply_review_delta
+
+
+def _assign_pks(model, objects):
+    """Проставляет id, если СУБД не вернула их из INSERT.
+
+    Вызывается в той же транзакции сразу после вставки: на SQLite
+    транзакция держит блокировку записи, поэтому последние id таблицы —
+    только что вставленные строки, в порядке вставки.
+    """
+    if not objects or objects[0].pk is not None:
+        return
+    pks = list(model.objects.order_by('-pk').values_list(
+        'pk', flat=True)[:len(objects)])
+    for obj, pk in zip(objects, reversed(pks)):
+        obj.pk = pk
+
+
+def create_reviews(reviews):
+    """Создаёт отзывы одного произведения и сдвигает его счётчики."""
+    if not reviews:
+        return reviews
+    with transaction.atomic():
+        reviews = Review.objects.bulk_create(reviews)
+        _assign_pks(Review, reviews)
+        title_id = reviews[0].title_id
+        scores = [review.score for review in reviews]
+        apply_review_delta(title_id, len(scores), sum(scores), Counter(scores))
+        days = defaultdict(lambda: [0, 0])
+        for review in reviews:
+            day = days[review_day(review)]
+            day[0] += 1
+            day[1] += review.score
+        for day, (count, total) in days.items():
+            apply_daily_delta(title_id, day, count, total)
+    return reviews
+
+
+def create_comments(comments):
+    """Создаёт комментарии одного отзыва и сдвигает его счётчик."""
+    if not comments:
+        return comments
+    with transaction.atomic():
+        comments = Comment.objects.bulk_create(comments)
+        _assign_pks(Comment, comments)
+        apply_comment_delta(comments[0].review_id, len(comments))
+    return comments
@@ -0,0 +1,103 @@
+"""Денормализованные счётчики дочерних объектов.
+
+Review.comment_count, Category.title_count и Genre.title_count
+сдвигаются при каждой записи комментария, произведения или связи
+произведения с жанром, поэтому их чтение не требует COUNT(*).
+reconcile_counters() сверяет счётчики с таблицами и исправляет дрейф
+после записей в обход сигналов (bulk_create, update(), загрузка CSV).
+"""
+from django.db.models import Count, F
+
+from .models import Category, Comment, Genre, Review, Title, TitleGenre
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def apply_count_delta(model, pks, count, field='title_count'):
+    """Сдвигает счётчик field у объектов pks одним UPDATE."""
+    pks = [pk for pk in pks if pk is not None]
+    if pks and count:
+        model.objects.filter(pk__in=pks).update(**{field: F(field) + count})
+
+
+def apply_comment_delta(review_id, count):
+    apply_count_delta(Review, [review_id], count, 'comment_count')
+
+
+def _counts(queryset, field):
+    return dict(
+        queryset.values(field).annotate(count=Count('id')).order_by(
+        ).values_list(field, 'count')
+    )
+
+
+def comment_counts(review_ids=None):
+    comments = Comment.objects.all()
+    if review_ids is not None:
+        comments = comments.filter(review__in=review_ids)
+    return _counts(comments, 'review')
+
+
+def category_title_counts(category_ids=None):
+    titles = Title.objects.all()
+    if category_ids is not None:
+        titles = titles.filter(category__in=category_ids)
+    return _counts(titles, 'category')
+
+
+def genre_title_counts(genre_ids=None):
+    links = TitleGenre.objects.all()
+    if genre_ids is not None:
+        links = links.filter(genre__in=genre_ids)
+    return _counts(links, 'genre')
+
+
+# Поле счётчика модели и функция, считающая его по таблицам.
+COUNTERS = {
+    Review: ('comment_count', comment_counts),
+    Category: ('title_count', category_title_counts),
+    Genre: ('title_count', genre_title_counts),
+}
+
+
+def recount(model, pks):
+    """Пересчитывает счётчик нескольких объектов по таблицам."""
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    field, counts = COUNTERS[model]
+    counts = counts(pks)
+    for pk in pks:
+        model.objects.filter(pk=pk).update(**{field: counts.get(pk, 0)})
+
+
+def reconcile(model, field, counts, fix=True,
+              batch_size=REBUILD_BATCH_SIZE):
+    """Сверяет счётчик с counts; возвращает число расхождений."""
+    drift = 0
+    last_id = 0
+    objects = model.objects.only('id', field)
+    while True:
+        batch = list(
+            objects.filter(pk__gt=last_id).order_by('pk')[:batch_size])
+        if not batch:
+            return drift
+        stale = [
+            obj for obj in batch
+            if getattr(obj, field) != counts.get(obj.pk, 0)
+        ]
+        for obj in stale:
+            setattr(obj, field, counts.get(obj.pk, 0))
+        if stale and fix:
+            model.objects.bulk_update(stale, [field])
+        drift += len(stale)
+        last_id = batch[-1].pk
+
+
+def reconcile_counters(fix=True, batch_size=REBUILD_BATCH_SIZE):
+    """Сверяет все счётчики; возвращает расхождения по каждому."""
+    return {
+        f'{model._meta.model_name}.{field}': reconcile(
+            model, field, counts(), fix, batch_size)
+        for model, (field, counts) in COUNTERS.items()
+    }
@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management import BaseCommand
+
+from reviews.csv_export import CHUNK_SIZE, EXPORTS, FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = 'Выгружает отзывы или комментарии в CSV или NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(EXPORTS))
+        parser.add_argument(
+            '--output', choices=sorted(FORMATS), default='csv',
+            help='Формат выгрузки')
+        parser.add_argument(
+            '--file', help='Файл для записи; по умолчанию stdout')
+        parser.add_argument(
+            '--chunk-size', type=int, default=CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за один раз')
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            options['table'], options['output'], options['chunk_size'])
+        if not options['file']:
+            for chunk in lines:
+                sys.stdout.write(chunk)
+            return
+        with open(options['file'], 'w', encoding='utf-8',
+                  newline='') as output:
+            for chunk in lines:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS('===SUCCESS==='))
@@ -0,0 +1,80 @@
+import re
+
+from django.core.management import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleDailyStats)
+
+# Строки плана, означающие полный просмотр таблицы. В SQLite это и
+# SCAN <таблица> USING [COVERING] INDEX: индекс читается целиком.
+FULL_SCAN = {
+    'sqlite': re.compile(r'\bSCAN (?:TABLE )?(\w+)'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+    'mysql': re.compile(r'\btype: ALL\b'),
+}
+TEMP_SORT = re.compile(r'TEMP B-TREE|Using filesort', re.IGNORECASE)
+
+
+def canonical_queries():
+    """Запросы, которые API выполняет на каждом обращении к списку.
+
+    Третий элемент — допустим ли полный просмотр: для страниц без
+    фильтра таблица читается по первичному ключу до LIMIT.
+    """
+    return (
+        ('titles', Title.objects.order_by('-id')[:10], True),
+        ('titles?category=',
+         Title.objects.filter(category__slug='slug').order_by('-id')[:10],
+         False),
+        ('titles?genre=',
+         Title.objects.filter(genre__slug='slug').order_by('-id')[:10],
+         False),
+        ('titles?year=',
+         Title.objects.filter(year=2000).order_by('-id')[:10], False),
+        ('titles/{id}/reviews',
+         Review.objects.filter(title_id=1).order_by('pub_date', 'id')[:10],
+         False),
+        ('reviews/{id}/comments',
+         Comment.objects.filter(review_id=1).order_by('pub_date', 'id')[:10],
+         False),
+        ('titles/top?window=',
+         TitleDailyStats.objects.filter(
+             day__range=('2000-01-01', '2000-01-07')).values(
+             'title').annotate(reviews=Sum('review_count')).order_by(
+             '-reviews')[:10],
+         False),
+        ('categories', Category.objects.order_by('name')[:10], True),
+        ('genres', Genre.objects.order_by('name')[:10], True),
+    )
+
+
+class Command(BaseCommand):
+    help = ('Показывает планы основных запросов API и отмечает '
+            'полные просмотры таблиц')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fail-on-scan', action='store_true',
+            help='Завершиться с ошибкой, если найден полный просмотр')
+
+    def handle(self, *args, **options):
+        full_scan = FULL_SCAN.get(connection.vendor)
+        problems = 0
+        for name, queryset, scan_allowed in canonical_queries():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            for line in queryset.explain().splitlines():
+                if (full_scan and full_scan.search(line)
+                        and not scan_allowed):
+                    problems += 1
+                    self.stdout.write(
+                        self.style.ERROR(f'  FULL SCAN  {line}'))
+                elif TEMP_SORT.search(line):
+                    self.stdout.write(self.style.WARNING(f'  SORT  {line}'))
+                else:
+                    self.stdout.write(f'  {line}')
+        if problems and options['fail_on_scan']:
+            raise CommandError(f'Полных просмотров таблиц: {problems}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Полных просмотров таблиц: {problems}'))
@@ -1,31 +1,56 @@
-import csv
+import os
 
-from django.core.management import BaseCommand
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import BaseCommand, CommandError
 
-from api_yamdb import settings
-from reviews.models import (User, Title, Category, Genre,
-                            GenreTitle, Comment, Review)
+from reviews.counters import reconcile_counters
+from reviews.csv_import import BATCH_SIZE, CSV_FILES, import_csv
+from reviews.leaderboard import rebuild_daily_stats
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_index
 
-MODELS_FILES = {
-    User: 'users.csv',
-    Category: 'category.csv',
-    Title: 'titles.csv',
-    Genre: 'genre.csv',
-    GenreTitle: 'genre_title.csv',
-    Review: 'review.csv',
-    Comment: 'comments.csv',
-
-}
+ALREADY_LOADED_ERROR_MESSAGE = (
+    'В таблицах уже есть данные: {tables}. Если нужно перезагрузить '
+    'данные из CSV-файлов, удалите файл db.sqlite3 и выполните '
+    '`python manage.py migrate` для новой пустой базы данных.'
+)
 
 
 class Command(BaseCommand):
-    def handle(self, *args, **options):
-        for model, file in MODELS_FILES.items():
-            with open(
-                    f'{settings.BASE_DIR}/static/data/{file}',
-                    'r', encoding='utf-8',
-            ) as table:
-                reader = csv.DictReader(table)
-                model.objects.bulk_create(model(**data) for data in reader)
+    help = 'Загружает данные из CSV-файлов в static/data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=os.path.join(settings.BASE_DIR, 'static/data'),
+            help='Каталог с CSV-файлами')
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одном INSERT')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов для разбора больших файлов')
 
+    def report(self, model, rows, elapsed):
+        rate = rows / elapsed if elapsed else rows
+        self.stdout.write(
+            f'{model._meta.db_table}: {rows} строк, '
+            f'{elapsed:.1f} с, {rate:.0f} строк/с')
+
+    def handle(self, *args, **options):
+        loaded = [
+            model._meta.db_table for model in CSV_FILES
+            if model.objects.exists()
+        ]
+        if loaded:
+            raise CommandError(ALREADY_LOADED_ERROR_MESSAGE.format(
+                tables=', '.join(loaded)))
+        import_csv(
+            options['path'], options['batch_size'], self.report,
+            workers=options['workers'])
+        rebuild_ratings()
+        rebuild_daily_stats()
+        reconcile_counters()
+        rebuild_index()
+        cache.clear()
         self.stdout.write(self.style.SUCCESS('===SUCCESS==='))
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management import BaseCommand
+
+from reviews.outbox import BATCH_SIZE, MAX_ATTEMPTS, send_pending
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество писем на одно SMTP-соединение')
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help='Сколько раз пытаться отправить письмо')
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а опрашивать очередь')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустой очереди, секунд')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            sent = send_pending(
+                options['batch_size'], options['max_attempts'])
+            total += sent
+            if sent:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'Отправлено писем: {total}'))
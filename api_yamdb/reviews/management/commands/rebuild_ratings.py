@@ -0,0 +1,25 @@
+from django.core.cache import cache
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.leaderboard import rebuild_daily_stats
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает рейтинг, счётчики отзывов и статистику по дням '
+            'всех произведений')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество произведений в одном UPDATE')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            updated = rebuild_ratings(batch_size=options['batch_size'])
+            days = rebuild_daily_stats()
+        # Запись шла в обход сигналов; сбрасываем кэш ответов и ETag.
+        cache.clear()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано произведений: {updated}, дней статистики: {days}'))
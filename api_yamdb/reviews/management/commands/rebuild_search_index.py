@@ -0,0 +1,16 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from reviews.search import is_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс произведений'
+
+    def handle(self, *args, **options):
+        if not is_available():
+            raise CommandError(
+                'Полнотекстовый индекс доступен только для SQLite с FTS5.')
+        with transaction.atomic():
+            rebuild_index()
+        self.stdout.write(self.style.SUCCESS('===SUCCESS==='))
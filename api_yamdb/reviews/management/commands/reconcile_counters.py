@@ -0,0 +1,31 @@
+from django.core.cache import cache
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = ('Сверяет счётчики комментариев отзывов и произведений '
+            'категорий и жанров с таблицами и исправляет расхождения')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество строк в одном UPDATE')
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать расхождения, ничего не меняя')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = reconcile_counters(
+                fix=not options['dry_run'], batch_size=options['batch_size'])
+        if not options['dry_run'] and any(drift.values()):
+            # Запись шла в обход сигналов; сбрасываем кэш ответов и ETag.
+            cache.clear()
+        for counter, count in drift.items():
+            self.stdout.write(f'{counter}: расхождений {count}')
+        self.stdout.write(self.style.SUCCESS(
+            'Проверка завершена' if options['dry_run']
+            else 'Счётчики исправлены'))
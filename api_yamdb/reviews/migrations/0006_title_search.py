@@ -0,0 +1,47 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+FTS_TABLE = 'reviews_title_fts'
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+                'name, description, genres, category, '
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            # SQLite собран без FTS5: поиск работает через icontains.
+            return
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            '(rowid, name, description, genres, category) '
+            "SELECT t.id, t.name, COALESCE(t.description, ''), "
+            "COALESCE((SELECT group_concat(g.name, ' ') "
+            'FROM reviews_titlegenre tg '
+            'JOIN reviews_genre g ON g.id = tg.genre_id '
+            "WHERE tg.title_id = t.id), ''), COALESCE(c.name, '') "
+            'FROM reviews_title t '
+            'LEFT JOIN reviews_category c ON c.id = t.category_id'
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_user_token_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 2.2.16 on 2026-10-17 07:36
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_comment_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Comment = apps.get_model('reviews', 'Comment')
+    stats = Comment.objects.values('review').annotate(
+        count=Count('id')).order_by()
+    for row in stats:
+        Review.objects.filter(pk=row['review']).update(
+            comment_count=row['count'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_score_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 2.2.16 on 2026-10-17 07:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_title_counts(apps, schema_editor):
+    Category = apps.get_model('reviews', 'Category')
+    Genre = apps.get_model('reviews', 'Genre')
+    Title = apps.get_model('reviews', 'Title')
+    TitleGenre = apps.get_model('reviews', 'TitleGenre')
+    for model, links, field in ((Category, Title, 'category'),
+                                (Genre, TitleGenre, 'genre')):
+        stats = links.objects.exclude(**{f'{field}__isnull': True}).values(
+            field).annotate(count=Count('id')).order_by()
+        for row in stats:
+            model.objects.filter(pk=row[field]).update(
+                title_count=row['count'])
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_review_comment_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='title_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество произведений'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='title_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество произведений'),
+        ),
+        migrations.RunPython(fill_title_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 2.2.16 on 2026-10-17 07:43
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+import django.db.models.deletion
+
+
+def fill_daily_stats(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    TitleDailyStats = apps.get_model('reviews', 'TitleDailyStats')
+    rows = Review.objects.annotate(day=TruncDate('pub_date')).values(
+        'title', 'day').annotate(
+            count=Count('id'), total=Sum('score')).order_by()
+    TitleDailyStats.objects.bulk_create(
+        TitleDailyStats(
+            title_id=row['title'], day=row['day'],
+            review_count=row['count'], score_sum=row['total'])
+        for row in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_category_genre_title_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleDailyStats',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='День')),
+                ('review_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('score_sum', models.PositiveIntegerField(default=0, verbose_name='Сумма оценок')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='reviews.Title')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения за день',
+                'verbose_name_plural': 'Статистика произведений по дням',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='titledailystats',
+            index=models.Index(fields=['day', 'title'], name='titledailystats_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titledailystats',
+            constraint=models.UniqueConstraint(fields=('title', 'day'), name='unique_title_day'),
+        ),
+        migrations.RunPython(fill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.16 on 2026-10-17 08:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_title_daily_stats'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='titledailystats',
+            name='titledailystats_day_idx',
+        ),
+        migrations.AddIndex(
+            model_name='titledailystats',
+            index=models.Index(fields=['day', 'title', 'review_count', 'score_sum'], name='titledailystats_day_idx'),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.core.validators import (MaxValueValidator, MinValueValidator,
                                     RegexValidator)
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 ADMIN = 'admin'
 MODERATOR = 'moderator'
@@ -18,6 +19,27 @@ MAX_LENGTH_NAME = 150
 MAX_LENGTH_EMAIL = 254
 MAX_LENGTH_CONF_CODE = 120
 MAX_LENGTH_SLUG = 50
+MIN_SCORE = 0
+MAX_SCORE = 10
+
+
+class CounterFieldsMixin:
+    """save() существующей строки не пишет поля COUNTER_FIELDS.
+
+    Счётчики сдвигаются UPDATE ... F(), и их значение в загруженном
+    объекте может быть устаревшим.
+    """
+    COUNTER_FIELDS = ()
+
+    def save(self, *args, **kwargs):
+        if (not self._state.adding and not kwargs.get('force_insert')
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
 
 
 class User(AbstractUser):
@@ -52,6 +74,37 @@ class User(AbstractUser):
         choices=ROLES,
         default=USER
     )
+    token_version = models.PositiveIntegerField(
+        'Версия токена',
+        default=0,
+        editable=False
+    )
+
+    # Поля, которые попадают в JWT; их изменение отзывает выданные токены.
+    TOKEN_CLAIM_FIELDS = (
+        'username', 'role', 'is_staff', 'is_superuser', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_claims = instance.token_claims()
+        return instance
+
+    def token_claims(self):
+        return {
+            field: self.__dict__.get(field)
+            for field in self.TOKEN_CLAIM_FIELDS
+        }
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_claims', None)
+        if loaded is not None and loaded != self.token_claims():
+            self.token_version += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._loaded_claims = self.token_claims()
 
     @property
     def is_admin(self):
@@ -72,7 +125,7 @@ class User(AbstractUser):
         return self.username
 
 
-class Category(models.Model):
+class Category(CounterFieldsMixin, models.Model):
     """Модель Категории"""
     SLUG_VALIDATOR = RegexValidator(r'^[-a-zA-Z0-9_]+$')
     name = models.CharField(
@@ -84,6 +137,13 @@ class Category(models.Model):
         max_length=MAX_LENGTH_SLUG,
         unique=True,
         validators=[SLUG_VALIDATOR])
+    title_count = models.PositiveIntegerField(
+        verbose_name='Количество произведений',
+        default=0,
+        editable=False
+    )
+
+    COUNTER_FIELDS = ('title_count',)
 
     class Meta:
         verbose_name = 'Категория'
@@ -93,7 +153,7 @@ class Category(models.Model):
         return self.name
 
 
-class Genre(models.Model):
+class Genre(CounterFieldsMixin, models.Model):
     """Модель Жанры"""
     SLUG_VALIDATOR = RegexValidator(r'^[-a-zA-Z0-9_]+$')
     name = models.CharField(
@@ -106,6 +166,13 @@ class Genre(models.Model):
         unique=True,
         validators=[SLUG_VALIDATOR]
     )
+    title_count = models.PositiveIntegerField(
+        verbose_name='Количество произведений',
+        default=0,
+        editable=False
+    )
+
+    COUNTER_FIELDS = ('title_count',)
 
     class Meta:
         verbose_name = 'Жанр'
@@ -115,7 +182,7 @@ class Genre(models.Model):
         return self.name
 
 
-class Title(models.Model):
+class Title(CounterFieldsMixin, models.Model):
     """Модель Произведения"""
     name = models.CharField(
         verbose_name='Название произведения',
@@ -141,14 +208,60 @@ class Title(models.Model):
         null=True,
         on_delete=models.SET_NULL
     )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        blank=True,
+        null=True,
+        editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+
+    COUNTER_FIELDS = ('rating', 'review_count', 'score_sum')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(
+                fields=['category', '-id'],
+                name='title_category_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'category_id' in field_names:
+            instance._loaded_category_id = values[
+                field_names.index('category_id')]
+        return instance
+
+
+# Гистограмма оценок: score_0 ... score_10 — число отзывов с такой оценкой.
+SCORE_FIELDS = {
+    score: f'score_{score}' for score in range(MIN_SCORE, MAX_SCORE + 1)
+}
+for score, field in SCORE_FIELDS.items():
+    Title.add_to_class(field, models.PositiveIntegerField(
+        verbose_name=f'Отзывов с оценкой {score}',
+        default=0,
+        editable=False
+    ))
+Title.COUNTER_FIELDS += tuple(SCORE_FIELDS.values())
+
 
 class TitleGenre(models.Model):
     """Промежуточная модель для реализации отношения многие ко многим"""
@@ -162,11 +275,57 @@ class TitleGenre(models.Model):
         null=True
     )
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='titlegenre_genre_title_idx'
+            )
+        ]
+
     def __str__(self):
         return f'{self.title} {self.genre}'
 
 
-class Review(models.Model):
+class TitleDailyStats(models.Model):
+    """Отзывы произведения за один день для рейтингов за период"""
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='daily_stats'
+    )
+    day = models.DateField('День')
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0
+    )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Статистика произведения за день'
+        verbose_name_plural = 'Статистика произведений по дням'
+        indexes = [
+            # Покрывающий: окно по дням читается без обращения к таблице.
+            models.Index(
+                fields=['day', 'title', 'review_count', 'score_sum'],
+                name='titledailystats_day_idx'
+            )
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'day'],
+                name='unique_title_day'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id} {self.day}'
+
+
+class Review(CounterFieldsMixin, models.Model):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
@@ -179,17 +338,28 @@ class Review(models.Model):
         related_name='reviews'
     )
     score = models.PositiveSmallIntegerField(
-        validators=[MinValueValidator(0),
-                    MaxValueValidator(10)]
+        validators=[MinValueValidator(MIN_SCORE),
+                    MaxValueValidator(MAX_SCORE)]
     )
     pub_date = models.DateTimeField(
         'date pablished',
         auto_now_add=True,
         db_index=True
     )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+        editable=False
+    )
 
     class Meta:
         ordering = ['pub_date']
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date'],
+                name='review_title_pub_date_idx'
+            )
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -197,9 +367,23 @@ class Review(models.Model):
             )
         ]
 
+    COUNTER_FIELDS = ('comment_count',)
+
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Счётчики произведения обновляет сигнал post_save
+        # в той же транзакции, что и сам отзыв.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -222,6 +406,70 @@ class Comment(models.Model):
     class Meta:
         ordering = ['pub_date']
         verbose_name = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date'],
+                name='comment_review_pub_date_idx'
+            )
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        # Счётчик комментариев отзыва обновляет сигнал post_save
+        # в той же транзакции, что и сам комментарий.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class OutboxMessage(models.Model):
+    """Исходящее письмо, ожидающее отправки"""
+    subject = models.CharField(
+        'Тема',
+        max_length=MAX_LENGTH
+    )
+    body = models.TextField('Текст')
+    from_email = models.CharField(
+        'Отправитель',
+        max_length=MAX_LENGTH_EMAIL
+    )
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=MAX_LENGTH_EMAIL
+    )
+    created = models.DateTimeField(
+        'Дата создания',
+        auto_now_add=True
+    )
+    next_attempt = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now
+    )
+    sent_at = models.DateTimeField(
+        'Дата отправки',
+        blank=True,
+        null=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0
+    )
+    last_error = models.TextField(
+        'Последняя ошибка',
+        blank=True
+    )
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        indexes = [
+            models.Index(
+                fields=['sent_at', 'next_attempt'],
+                name='outbox_pending_idx'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,125 @@
+"""Очередь исходящих писем.
+
+Письмо сначала сохраняется в OutboxMessage в транзакции запроса,
+а отправляется позже пачками через одно SMTP-соединение.
+Способ отправки задаёт settings.EMAIL_OUTBOX_DISPATCH:
+
+- ``after_response`` — после того как ответ отдан клиенту
+  (сигнал request_finished), в том же процессе;
+- ``thread`` — в фоновом потоке процесса;
+- ``command`` — только командой ``process_outbox``.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection as db_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+LEASE = timedelta(minutes=5)
+
+_state = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def enqueue(subject, message, from_email, recipient_list):
+    """Ставит письма в очередь; отправка начнётся после коммита."""
+    OutboxMessage.objects.bulk_create(
+        OutboxMessage(subject=subject, body=message,
+                      from_email=from_email, recipient=recipient)
+        for recipient in recipient_list
+    )
+    transaction.on_commit(_schedule)
+
+
+def _schedule():
+    mode = settings.EMAIL_OUTBOX_DISPATCH
+    if mode == 'after_response':
+        _state.pending = True
+    elif mode == 'thread':
+        _get_executor().submit(_send_in_thread)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='outbox')
+        return _executor
+
+
+def _send_in_thread():
+    try:
+        send_pending()
+    finally:
+        db_connection.close()
+
+
+def flush_after_response():
+    """Отправляет письма, поставленные в очередь текущим запросом."""
+    if getattr(_state, 'pending', False):
+        _state.pending = False
+        send_pending()
+
+
+def _claim(message, now):
+    """Забирает письмо, чтобы параллельный отправитель его пропустил."""
+    return OutboxMessage.objects.filter(
+        pk=message.pk, sent_at=None, next_attempt__lte=now
+    ).update(next_attempt=now + LEASE) == 1
+
+
+def send_pending(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS):
+    """Отправляет одну пачку писем; возвращает число отправленных."""
+    now = timezone.now()
+    messages = [
+        message for message in OutboxMessage.objects.filter(
+            sent_at=None, attempts__lt=max_attempts, next_attempt__lte=now
+        )[:batch_size]
+        if _claim(message, now)
+    ]
+    if not messages:
+        return 0
+    mail_connection = get_connection()
+    try:
+        mail_connection.open()
+    except Exception as error:
+        for message in messages:
+            _failed(message, error)
+        return 0
+    sent = 0
+    try:
+        for message in messages:
+            try:
+                EmailMessage(
+                    message.subject, message.body, message.from_email,
+                    [message.recipient], connection=mail_connection
+                ).send()
+            except Exception as error:
+                _failed(message, error)
+            else:
+                message.sent_at = timezone.now()
+                message.attempts += 1
+                message.save(update_fields=['sent_at', 'attempts'])
+                sent += 1
+    finally:
+        mail_connection.close()
+    return sent
+
+
+def _failed(message, error):
+    message.attempts += 1
+    message.last_error = repr(error)
+    message.next_attempt = (
+        timezone.now() + RETRY_DELAY * 2 ** (message.attempts - 1))
+    message.save(update_fields=['attempts', 'last_error', 'next_attempt'])
@@ -0,0 +1,72 @@
+"""Денормализованный рейтинг произведений.
+
+Поля Title.review_count, Title.score_sum, Title.rating и гистограмма
+оценок Title.score_0 ... score_10 обновляются при каждой записи отзыва,
+поэтому чтение рейтинга не требует агрегации по таблице отзывов.
+"""
+from django.db.models import Count, F, FloatField, Sum
+from django.db.models.functions import Cast, NullIf
+
+from .models import SCORE_FIELDS, Review, Title
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def apply_review_delta(title_id, count=0, score_sum=0, scores=None):
+    """Сдвигает счётчики произведения одним UPDATE.
+
+    scores — изменения гистограммы: {оценка: +1 или -1}.
+    """
+    buckets = {
+        SCORE_FIELDS[score]: F(SCORE_FIELDS[score]) + delta
+        for score, delta in (scores or {}).items() if delta
+    }
+    if not count and not score_sum and not buckets:
+        return
+    new_count = F('review_count') + count
+    new_sum = F('score_sum') + score_sum
+    Title.objects.filter(pk=title_id).update(
+        review_count=new_count,
+        score_sum=new_sum,
+        rating=(Cast(new_sum, FloatField())
+                / Cast(NullIf(new_count, 0), FloatField())),
+        **buckets
+    )
+
+
+def rebuild_ratings(title_ids=None, batch_size=REBUILD_BATCH_SIZE):
+    """Пересчитывает счётчики произведений по таблице отзывов."""
+    reviews = Review.objects.all()
+    titles = Title.objects.only('id')
+    if title_ids is not None:
+        reviews = reviews.filter(title_id__in=title_ids)
+        titles = titles.filter(pk__in=title_ids)
+    stats = {
+        row['title']: (row['count'], row['total'])
+        for row in reviews.values('title').annotate(
+            count=Count('id'), total=Sum('score')).order_by()
+    }
+    buckets = {
+        (row['title'], row['score']): row['count']
+        for row in reviews.values('title', 'score').annotate(
+            count=Count('id')).order_by()
+    }
+    updated = 0
+    last_id = 0
+    while True:
+        batch = list(
+            titles.filter(pk__gt=last_id).order_by('pk')[:batch_size])
+        if not batch:
+            return updated
+        for title in batch:
+            count, total = stats.get(title.id, (0, 0))
+            title.review_count = count
+            title.score_sum = total
+            title.rating = total / count if count else None
+            for score, field in SCORE_FIELDS.items():
+                setattr(title, field, buckets.get((title.id, score), 0))
+        Title.objects.bulk_update(
+            batch,
+            ['review_count', 'score_sum', 'rating', *SCORE_FIELDS.values()])
+        updated += len(batch)
+        last_id = batch[-1].pk
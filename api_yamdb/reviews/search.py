@@ -0,0 +1,104 @@
+"""Полнотекстовый поиск произведений на SQLite FTS5.
+
+Таблица reviews_title_fts хранит название, описание, жанры и категорию
+каждого произведения (rowid совпадает с Title.id) и обновляется
+сигналами. На других СУБД или без FTS5 поиск сводится к icontains
+по названию и описанию.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Title
+
+FTS_TABLE = 'reviews_title_fts'
+INDEX_SQL = f'''
+    INSERT INTO {FTS_TABLE} (rowid, name, description, genres, category)
+    SELECT t.id, t.name, COALESCE(t.description, ''),
+           COALESCE((SELECT group_concat(g.name, ' ')
+                     FROM reviews_titlegenre tg
+                     JOIN reviews_genre g ON g.id = tg.genre_id
+                     WHERE tg.title_id = t.id), ''),
+           COALESCE(c.name, '')
+    FROM reviews_title t
+    LEFT JOIN reviews_category c ON c.id = t.category_id
+'''
+TOKEN_RE = re.compile(r'\w+')
+# SQLite ограничивает число параметров одного запроса.
+ID_BATCH_SIZE = 500
+
+_available = set()
+
+
+def is_available():
+    if connection.alias in _available:
+        return True
+    if (connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()):
+        _available.add(connection.alias)
+        return True
+    return False
+
+
+def _id_batches(title_ids):
+    title_ids = list(title_ids)
+    for start in range(0, len(title_ids), ID_BATCH_SIZE):
+        batch = title_ids[start:start + ID_BATCH_SIZE]
+        yield batch, ', '.join(['%s'] * len(batch))
+
+
+def index_titles(title_ids):
+    """Переиндексирует произведения с указанными id."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for batch, placeholders in _id_batches(title_ids):
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                batch)
+            cursor.execute(
+                f'{INDEX_SQL} WHERE t.id IN ({placeholders})', batch)
+
+
+def unindex_titles(title_ids):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for batch, placeholders in _id_batches(title_ids):
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})',
+                batch)
+
+
+def rebuild_index():
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(INDEX_SQL)
+
+
+def match_expression(query):
+    """Запрос FTS5 из слов пользователя: каждое слово — префикс."""
+    return ' '.join(f'"{token}"*' for token in TOKEN_RE.findall(query))
+
+
+def search_titles(queryset, query):
+    """Фильтрует произведения по запросу и сортирует по релевантности."""
+    match = match_expression(query)
+    if not match:
+        return queryset
+    if not is_available():
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query))
+    return queryset.extra(
+        select={'search_rank': f'bm25({FTS_TABLE})'},
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = {Title._meta.db_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match],
+        order_by=['search_rank', '-id'],
+    )
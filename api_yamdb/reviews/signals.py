@@ -0,0 +1,215 @@
+from threading import local
+
+from django.core.signals import request_finished
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from . import search
+from .counters import apply_comment_delta, apply_count_delta, recount
+from .leaderboard import apply_daily_delta, rebuild_daily_stats, review_day
+from .models import Category, Comment, Genre, Review, Title, TitleGenre
+from .outbox import flush_after_response
+from .ratings import apply_review_delta, rebuild_ratings
+
+
+# Произведения и отзывы, которые сейчас удаляются вместе с зависимыми
+# строками: сдвигать их счётчики при каскаде незачем.
+_deleting = local()
+
+
+def _deleting_pks(model):
+    if not hasattr(_deleting, 'pks'):
+        _deleting.pks = {Title: set(), Review: set()}
+    return _deleting.pks[model]
+
+
+@receiver(pre_delete, sender=Title)
+@receiver(pre_delete, sender=Review)
+def parent_deleting(sender, instance, **kwargs):
+    _deleting_pks(sender).add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Review)
+def parent_deleted(sender, instance, **kwargs):
+    _deleting_pks(sender).discard(instance.pk)
+
+
+def _loaded_review(instance):
+    """Значения title_id и score на момент загрузки отзыва из БД."""
+    loaded = getattr(instance, '_loaded_values', None) or {}
+    if 'title_id' in loaded and 'score' in loaded:
+        return loaded['title_id'], loaded['score']
+    return None
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = _loaded_review(instance)
+    score = instance.score
+    day = review_day(instance)
+    if created:
+        apply_review_delta(instance.title_id, 1, score, {score: 1})
+        apply_daily_delta(instance.title_id, day, 1, score)
+    elif loaded is None:
+        rebuild_ratings(title_ids=[instance.title_id])
+        rebuild_daily_stats(title_ids=[instance.title_id])
+    elif loaded[0] != instance.title_id:
+        apply_review_delta(loaded[0], -1, -loaded[1], {loaded[1]: -1})
+        apply_review_delta(instance.title_id, 1, score, {score: 1})
+        apply_daily_delta(loaded[0], day, -1, -loaded[1])
+        apply_daily_delta(instance.title_id, day, 1, score)
+    elif loaded[1] != score:
+        apply_review_delta(
+            instance.title_id, 0, score - loaded[1],
+            {loaded[1]: -1, score: 1})
+        apply_daily_delta(instance.title_id, day, 0, score - loaded[1])
+    instance._loaded_values = {
+        'title_id': instance.title_id, 'score': instance.score}
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    title_id, score = (
+        _loaded_review(instance) or (instance.title_id, instance.score))
+    if title_id in _deleting_pks(Title):
+        return
+    apply_review_delta(title_id, -1, -score, {score: -1})
+    apply_daily_delta(title_id, review_day(instance), -1, -score)
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        apply_comment_delta(instance.review_id, 1)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if instance.review_id not in _deleting_pks(Review):
+        apply_comment_delta(instance.review_id, -1)
+
+
+@receiver(request_finished)
+def request_done(sender, **kwargs):
+    flush_after_response()
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_titles([instance.pk])
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    search.unindex_titles([instance.pk])
+
+
+@receiver(pre_save, sender=Title)
+def title_saving(sender, instance, raw=False, **kwargs):
+    # Категория объекта, созданного не из БД, читается перед записью.
+    if (not raw and not instance._state.adding
+            and not hasattr(instance, '_loaded_category_id')):
+        instance._loaded_category_id = Title.objects.filter(
+            pk=instance.pk).values_list('category_id', flat=True).first()
+
+
+@receiver(post_save, sender=Title)
+def title_category_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = None if created else getattr(
+        instance, '_loaded_category_id', None)
+    if loaded != instance.category_id:
+        apply_count_delta(Category, [loaded], -1)
+        apply_count_delta(Category, [instance.category_id], 1)
+    instance._loaded_category_id = instance.category_id
+
+
+@receiver(post_delete, sender=Title)
+def title_category_deleted(sender, instance, **kwargs):
+    apply_count_delta(Category, [getattr(
+        instance, '_loaded_category_id', instance.category_id)], -1)
+
+
+@receiver(post_save, sender=TitleGenre)
+def title_genre_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        apply_count_delta(Genre, [instance.genre_id], 1)
+
+
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_deleted(sender, instance, **kwargs):
+    apply_count_delta(Genre, [instance.genre_id], -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genre_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """Счётчики жанров при title.genre.add/remove/set/clear.
+
+    В post_add pk_set содержит только действительно добавленные связи,
+    поэтому счётчики сдвигаются; при удалении pk_set может включать
+    отсутствующие связи, и затронутые жанры пересчитываются.
+    """
+    if action == 'post_add':
+        if reverse:
+            apply_count_delta(Genre, [instance.pk], len(pk_set))
+        else:
+            apply_count_delta(Genre, pk_set, 1)
+    elif action == 'pre_clear' and not reverse:
+        instance._cleared_genre_ids = list(
+            instance.genre.values_list('pk', flat=True))
+    elif action == 'post_remove':
+        recount(Genre, [instance.pk] if reverse else pk_set)
+    elif action == 'post_clear':
+        recount(Genre, [instance.pk] if reverse else getattr(
+            instance, '_cleared_genre_ids', ()))
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_titles([instance.title_id])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        search.index_titles([instance.pk])
+    elif pk_set:
+        search.index_titles(pk_set)
+
+
+def _related_title_ids(instance):
+    if isinstance(instance, Category):
+        titles = Title.objects.filter(category=instance)
+    else:
+        titles = Title.objects.filter(genre=instance)
+    return list(titles.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Genre)
+def catalog_saved(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        search.index_titles(_related_title_ids(instance))
+
+
+@receiver(pre_delete, sender=Category)
+@receiver(pre_delete, sender=Genre)
+def catalog_deleting(sender, instance, **kwargs):
+    instance._search_title_ids = _related_title_ids(instance)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Genre)
+def catalog_deleted(sender, instance, **kwargs):
+    search.index_titles(getattr(instance, '_search_title_ids', ()))
@@ -0,0 +1,13 @@
+"""Нагрузочные замеры основных сценариев API.
+
+Запуск из корня репозитория::
+
+    python -m benchmarks --scale small
+    python -m benchmarks --scale large --iterations 500
+    python -m benchmarks --scale small --save-baseline
+
+Данные создаются в отдельной базе SQLite (``--database``), запросы
+выполняются в том же процессе через APIClient. Результаты сравниваются
+с benchmarks/baseline.json: рост p95 больше допуска или рост числа
+запросов считается регрессией.
+"""
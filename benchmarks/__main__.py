@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+import tempfile
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(BASE_DIR, 'benchmarks', 'baseline.json')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Замеры основных сценариев API')
+    parser.add_argument(
+        '--scale', default='small', choices=('small', 'medium', 'large'))
+    parser.add_argument('--titles', type=int)
+    parser.add_argument('--reviews', type=int)
+    parser.add_argument('--comments', type=int)
+    parser.add_argument(
+        '--database',
+        help='Файл SQLite; если в нём уже есть данные, засев пропускается')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--flow', action='append', dest='flows',
+                        help='Запустить только указанные сценарии')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.25,
+        help='Допустимый рост p95 относительно baseline (доля)')
+    parser.add_argument('--output', help='Сохранить результат в JSON')
+    return parser.parse_args()
+
+
+def setup_django(database):
+    sys.path.insert(0, os.path.join(BASE_DIR, 'api_yamdb'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = database
+    django.setup()
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    # testserver в ALLOWED_HOSTS и почта в памяти вместо файлов.
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+
+
+def main():
+    args = parse_args()
+    database = args.database or os.path.join(
+        tempfile.gettempdir(), f'yamdb_bench_{args.scale}.sqlite3')
+    setup_django(database)
+
+    import json
+
+    from reviews.models import Title
+
+    from .flows import FLOWS
+    from .runner import (compare, format_report, load_baseline, run,
+                         save_baseline)
+    from .seed import SCALES, Dataset, seed
+
+    if Title.objects.exists():
+        print(f'Используются данные из {database}')
+        data = Dataset()
+    else:
+        scale = dict(SCALES[args.scale])
+        for name in scale:
+            if getattr(args, name) is not None:
+                scale[name] = getattr(args, name)
+        print(f'Засев {database}: {scale}')
+        data = seed(**scale)
+
+    for name in args.flows or ():
+        if name not in FLOWS:
+            sys.exit(f'Неизвестный сценарий {name}: {", ".join(FLOWS)}')
+    results = run(data, args.iterations, args.flows)
+    print(format_report(results))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        save_baseline(args.baseline, args.scale, results)
+        print(f'Сохранено в {args.baseline}')
+        return
+    regressions = compare(
+        results, load_baseline(args.baseline, args.scale), args.tolerance)
+    for line in regressions:
+        print(f'REGRESSION {line}')
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Сценарии, которые прогоняет замер.
+
+Каждый сценарий получает APIClient, засеянный Dataset и генератор
+случайных чисел и выполняет один «пользовательский» шаг.
+"""
+from itertools import count
+
+from reviews.models import User
+
+_signups = count()
+
+
+def check(response, status=200):
+    assert response.status_code == status, (
+        response.status_code, response.content[:200])
+    return response
+
+
+def title_list(client, data, rng):
+    params = {}
+    choice = rng.randrange(4)
+    if choice == 0:
+        params['page'] = rng.randint(1, data.title_pages)
+    elif choice == 1:
+        params['category'] = rng.choice(data.categories)
+    elif choice == 2:
+        params['genre'] = rng.choice(data.genres)
+    elif choice == 3:
+        params['year'] = rng.randint(*data.years)
+    check(client.get('/api/v1/titles/', params))
+
+
+def title_detail(client, data, rng):
+    response = check(client.get(f'/api/v1/titles/{data.title_id(rng)}/'))
+    assert 'rating' in response.json()
+
+
+def review_list(client, data, rng):
+    check(client.get(f'/api/v1/titles/{data.title_id(rng)}/reviews/'))
+
+
+def comment_list(client, data, rng):
+    title_id, review_id = data.review_ids(rng)
+    check(client.get(
+        f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'))
+
+
+def signup_token(client, data, rng):
+    """Регистрация и получение токена.
+
+    Код подтверждения читается из БД, это один лишний запрос в замере.
+    """
+    username = f'signup{next(_signups)}'
+    check(client.post('/api/v1/auth/signup/', {
+        'username': username, 'email': f'{username}@yamdb.fake'}))
+    code = User.objects.values_list(
+        'confirmation_code', flat=True).get(username=username)
+    check(client.post('/api/v1/auth/token/', {
+        'username': username, 'confirmation_code': code}))
+
+
+FLOWS = {
+    'title_list': title_list,
+    'title_detail': title_detail,
+    'review_list': review_list,
+    'comment_list': comment_list,
+    'signup_token': signup_token,
+}
@@ -0,0 +1,106 @@
+"""Прогон сценариев, отчёт и сравнение с сохранённым результатом."""
+import json
+import random
+import time
+
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.metrics import percentile
+
+from .flows import FLOWS
+
+PERCENTILES = (50, 95, 99)
+
+
+def run_flow(flow, data, iterations, warmup=5, seed=0):
+    client = APIClient()
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        flow(client, data, rng)
+    latencies = []
+    queries = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            flow(client, data, rng)
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+        mail.outbox = []
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    result = {
+        'iterations': iterations,
+        'rps': round(iterations / elapsed, 1),
+        'queries': round(sum(queries) / iterations, 2),
+        'max_queries': max(queries),
+    }
+    for percent in PERCENTILES:
+        result[f'p{percent}_ms'] = round(
+            percentile(latencies, percent), 2)
+    return result
+
+
+def run(data, iterations, flows=None, seed=0):
+    return {
+        name: run_flow(FLOWS[name], data, iterations, seed=seed)
+        for name in flows or FLOWS
+    }
+
+
+def format_report(results):
+    lines = [
+        f'{"flow":<14}{"rps":>9}{"p50 ms":>9}{"p95 ms":>9}'
+        f'{"p99 ms":>9}{"queries":>9}'
+    ]
+    for name, result in results.items():
+        lines.append(
+            f'{name:<14}{result["rps"]:>9}{result["p50_ms"]:>9}'
+            f'{result["p95_ms"]:>9}{result["p99_ms"]:>9}'
+            f'{result["queries"]:>9}')
+    return '\n'.join(lines)
+
+
+def compare(results, baseline, tolerance):
+    """Регрессии относительно baseline: список строк.
+
+    Задержка сравнивается по p95 с допуском tolerance (доля), число
+    запросов — без допуска: оно не зависит от машины.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        limit = reference['p95_ms'] * (1 + tolerance)
+        if result['p95_ms'] > limit:
+            regressions.append(
+                f'{name}: p95 {result["p95_ms"]} мс > {limit:.2f} мс')
+        if result['max_queries'] > reference['max_queries']:
+            regressions.append(
+                f'{name}: запросов {result["max_queries"]} > '
+                f'{reference["max_queries"]}')
+    return regressions
+
+
+def load_baseline(path, scale):
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file).get(scale, {})
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, scale, results):
+    try:
+        with open(path, encoding='utf-8') as file:
+            stored = json.load(file)
+    except FileNotFoundError:
+        stored = {}
+    stored[scale] = results
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(stored, file, ensure_ascii=False, indent=2, sort_keys=True)
+        file.write('\n')
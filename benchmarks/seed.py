@@ -0,0 +1,137 @@
+"""Синтетические данные для замеров через bulk_create."""
+import random
+from itertools import islice
+
+from django.core.cache import cache
+from django.db import transaction
+
+from api.pagination import TitlePagination
+from reviews.counters import reconcile_counters
+from reviews.leaderboard import rebuild_daily_stats
+from reviews.models import (Category, Comment, Genre, Review, Title,
+                            TitleGenre, User)
+from reviews.ratings import rebuild_ratings
+from reviews.search import rebuild_index
+
+SCALES = {
+    'small': {'titles': 100, 'reviews': 2_000, 'comments': 5_000},
+    'medium': {'titles': 1_000, 'reviews': 100_000, 'comments': 500_000},
+    'large': {'titles': 10_000, 'reviews': 1_000_000,
+              'comments': 5_000_000},
+}
+CATEGORIES = 10
+GENRES = 20
+GENRES_PER_TITLE = 2
+BATCH_SIZE = 5000
+WORDS = ('драма', 'комедия', 'война', 'мир', 'отец', 'море', 'город',
+         'ночь', 'песня', 'дорога', 'сердце', 'звезда')
+
+
+class Dataset:
+    """Диапазоны id засеянных объектов.
+
+    Отзыв k относится к произведению k % titles, поэтому пара
+    (произведение, отзыв) вычисляется без запросов к БД.
+    """
+
+    def __init__(self):
+        self.titles = Title.objects.count()
+        self.reviews = Review.objects.count()
+        self.first_title = Title.objects.order_by('id').values_list(
+            'id', flat=True).first()
+        self.first_review = Review.objects.order_by('id').values_list(
+            'id', flat=True).first()
+        self.categories = list(
+            Category.objects.values_list('slug', flat=True))
+        self.genres = list(Genre.objects.values_list('slug', flat=True))
+        self.years = (1900, 2020)
+        # Замер листает не дальше пятой страницы списка произведений.
+        self.title_pages = min(
+            5, max(1, -(-self.titles // TitlePagination().page_size)))
+
+    def title_id(self, rng):
+        return self.first_title + rng.randrange(self.titles)
+
+    def review_ids(self, rng):
+        index = rng.randrange(self.reviews)
+        return (self.first_title + index % self.titles,
+                self.first_review + index)
+
+
+def text(rng, words=8):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def bulk_create(model, objects):
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, BATCH_SIZE))
+        if not batch:
+            return
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+
+
+def seed(titles, reviews, comments, seed=0, report=print):
+    """Заполняет пустую базу; возвращает Dataset."""
+    if Title.objects.exists():
+        raise ValueError('База для замеров должна быть пустой.')
+    rng = random.Random(seed)
+    authors = max(1, -(-reviews // titles))
+
+    report(f'users: {authors}')
+    bulk_create(User, (
+        User(username=f'bench{index}', email=f'bench{index}@yamdb.fake')
+        for index in range(authors)
+    ))
+    bulk_create(Category, (
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(CATEGORIES)
+    ))
+    bulk_create(Genre, (
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(GENRES)
+    ))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+
+    report(f'titles: {titles}')
+    bulk_create(Title, (
+        Title(name=text(rng, 3), year=rng.randint(1900, 2020),
+              description=text(rng, 20),
+              category_id=rng.choice(category_ids))
+        for _ in range(titles)
+    ))
+    title_ids = list(Title.objects.order_by('id').values_list(
+        'id', flat=True))
+    bulk_create(TitleGenre, (
+        TitleGenre(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in rng.sample(genre_ids, GENRES_PER_TITLE)
+    ))
+
+    report(f'reviews: {reviews}')
+    bulk_create(Review, (
+        Review(title_id=title_ids[index % titles],
+               author_id=user_ids[index // titles],
+               text=text(rng), score=rng.randint(1, 10))
+        for index in range(reviews)
+    ))
+    first_review = Review.objects.order_by('id').values_list(
+        'id', flat=True).first()
+
+    report(f'comments: {comments}')
+    bulk_create(Comment, (
+        Comment(review_id=first_review + rng.randrange(reviews),
+                author_id=rng.choice(user_ids), text=text(rng))
+        for _ in range(comments)
+    ))
+
+    with transaction.atomic():
+        rebuild_ratings()
+        rebuild_daily_stats()
+        reconcile_counters()
+        rebuild_index()
+    cache.clear()
+    return Dataset()
@@ -0,0 +1,133 @@
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def check_title(self, title_id, count, score_sum, rating):
+        from reviews.models import Title
+
+        title = Title.objects.get(pk=title_id)
+        assert (title.review_count, title.score_sum, title.rating) == (
+            count, score_sum, rating
+        ), (
+            'Проверьте, что счётчики `review_count`, `score_sum` и `rating` '
+            'произведения обновляются при каждой записи отзыва.'
+        )
+
+    def test_01_counters_follow_reviews(self, admin_client, admin,
+                                        user_client, user):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        self.check_title(title_id, 2, 10, 5.0)
+
+        user_client.patch(f'{url}{reviews[1]["id"]}/', data={'score': 8})
+        self.check_title(title_id, 2, 13, 6.5)
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        self.check_title(title_id, 1, 8, 8.0)
+
+        user_client.delete(f'{url}{reviews[1]["id"]}/')
+        self.check_title(title_id, 0, 0, None)
+
+    def test_02_rebuild_ratings(self, admin_client, admin, user_client, user):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        Title.objects.update(review_count=0, score_sum=0, rating=None)
+
+        call_command('rebuild_ratings')
+        self.check_title(title_id, 2, 10, 5.0)
+        response = admin_client.get(f'/api/v1/titles/{title_id}/')
+        assert response.json()['rating'] == 5
+
+    def test_03_rating_distribution(self, client, admin_client, admin,
+                                    user_client, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        rating_url = f'/api/v1/titles/{title_id}/rating/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(rating_url)
+        assert response.status_code == 200
+        assert len(context.captured_queries) == 1, (
+            'Проверьте, что гистограмма оценок читается одним запросом '
+            'из счётчиков произведения.'
+        )
+        data = response.json()
+        assert data['rating'] == 5.0
+        assert data['review_count'] == 2
+        assert data['scores'] == {
+            str(score): 2 if score == 5 else 0 for score in range(11)}
+
+        url = f'/api/v1/titles/{title_id}/reviews/'
+        user_client.patch(f'{url}{reviews[1]["id"]}/', data={'score': 8})
+        scores = client.get(rating_url).json()['scores']
+        assert (scores['5'], scores['8']) == (1, 1), (
+            'Проверьте, что гистограмма обновляется при изменении оценки.'
+        )
+
+        admin_client.delete(f'{url}{reviews[0]["id"]}/')
+        Title.objects.update(score_8=0)
+        call_command('rebuild_ratings')
+        scores = client.get(rating_url).json()['scores']
+        assert sum(scores.values()) == 1 and scores['8'] == 1
+        assert client.get('/api/v1/titles/999/rating/').status_code == 404
+
+    def test_04_cascade_skips_deleted_parents(self, admin, user):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Comment, Review, Title
+
+        title, other = (
+            Title.objects.create(name=name, year=2000)
+            for name in ('Побег', 'Леон'))
+        for author in (admin, user):
+            review = Review.objects.create(
+                title=title, author=author, text='Отзыв', score=5)
+            for number in range(3):
+                Comment.objects.create(
+                    review=review, author=admin, text=f'Комментарий {number}')
+        kept = Review.objects.create(
+            title=other, author=admin, text='Отзыв', score=6)
+        dropped = Review.objects.create(
+            title=other, author=user, text='Отзыв', score=8)
+        Comment.objects.create(review=dropped, author=admin, text='Ещё')
+
+        with CaptureQueriesContext(connection) as context:
+            title.delete()
+        updates = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        assert not updates, (
+            'Проверьте, что каскадное удаление произведения не сдвигает '
+            'счётчики удаляемых отзывов и статистики.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            dropped.delete()
+        assert not any(
+            'UPDATE "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что удаление отзыва не сдвигает счётчик '
+            'комментариев самого отзыва.'
+        )
+        self.check_title(other.pk, 1, 6, 6.0)
+        Comment.objects.create(review=kept, author=admin, text='Ещё')
+        Comment.objects.filter(review=kept).delete()
+        kept.refresh_from_db()
+        assert kept.comment_count == 0
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    @pytest.fixture
+    def make_title(self):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+
+        def make_title(idx):
+            title = Title.objects.create(
+                name=f'Произведение {idx}', year=2000, category=category)
+            title.genre.set(genres)
+            return title
+        return make_title
+
+    def test_01_title_list(self, client, make_title):
+        url = '/api/v1/titles/'
+        make_title(0)
+        single = count_queries(client, url)
+        for idx in range(1, 5):
+            make_title(idx)
+        assert count_queries(client, url) == single, (
+            f'Проверьте, что количество SQL-запросов к `{url}` '
+            'не зависит от количества произведений на странице.'
+        )
+
+    def test_02_review_and_comment_list(self, client, make_title,
+                                        admin, user, moderator):
+        from reviews.models import Comment, Review
+
+        title = make_title(0)
+        authors = [admin, user, moderator]
+        reviews_url = f'/api/v1/titles/{title.id}/reviews/'
+        review = Review.objects.create(
+            title=title, author=authors[0], text='text', score=5)
+        Comment.objects.create(review=review, author=authors[0], text='text')
+        comments_url = f'{reviews_url}{review.id}/comments/'
+        single_reviews = count_queries(client, reviews_url)
+        single_comments = count_queries(client, comments_url)
+
+        for author in authors[1:]:
+            Review.objects.create(
+                title=title, author=author, text='text', score=5)
+            Comment.objects.create(review=review, author=author, text='text')
+        assert count_queries(client, reviews_url) == single_reviews, (
+            f'Проверьте, что количество SQL-запросов к `{reviews_url}` '
+            'не зависит от количества отзывов на странице.'
+        )
+        assert count_queries(client, comments_url) == single_comments, (
+            f'Проверьте, что количество SQL-запросов к `{comments_url}` '
+            'не зависит от количества комментариев на странице.'
+        )
+
+    def test_03_parent_loaded_once(self, make_title, user_client, admin):
+        from reviews.models import Review
+
+        title = make_title(0)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+
+        def title_selects(context):
+            return [
+                query['sql'] for query in context.captured_queries
+                if query['sql'].startswith('SELECT')
+                and 'FROM "reviews_title"' in query['sql']
+            ]
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'т', 'score': 5})
+        assert response.status_code == 201
+        assert len(title_selects(context)) == 1, (
+            'Проверьте, что при создании отзыва произведение загружается '
+            'из БД один раз.'
+        )
+
+        review = Review.objects.create(
+            title=title, author=admin, text='text', score=5)
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(
+                f'{url}{review.id}/comments/', data={'text': 'т'})
+        assert response.status_code == 201
+        assert not title_selects(context)
+
+        assert user_client.get(
+            f'/api/v1/titles/{title.id + 1}/reviews/').status_code == 404
+        assert user_client.get(
+            f'/api/v1/titles/{title.id + 1}/reviews/{review.id}/comments/'
+        ).status_code == 404
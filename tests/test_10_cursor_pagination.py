@@ -0,0 +1,51 @@
+import pytest
+
+
+def collect_pages(client, url):
+    pages = []
+    while url:
+        data = client.get(url).json()
+        assert 'count' not in data, (
+            'Проверьте, что курсорная пагинация не выполняет подсчёт '
+            'общего количества объектов.'
+        )
+        pages.append([obj['id'] for obj in data['results']])
+        url = data['next']
+    return pages
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    def test_01_titles(self, client):
+        from reviews.models import Title
+
+        ids = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000).id
+            for idx in range(7)
+        ]
+        pages = collect_pages(client, '/api/v1/titles/?pagination=cursor')
+        assert pages == [ids[:1:-1], ids[1::-1]], (
+            'Проверьте, что курсорный режим `/api/v1/titles/` отдаёт '
+            'произведения по убыванию `id`.'
+        )
+
+    def test_02_reviews(self, client, django_user_model):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        ids = [
+            Review.objects.create(
+                title=title, text='text', score=5,
+                author=django_user_model.objects.create(
+                    username=f'user{idx}', email=f'user{idx}@yamdb.fake')
+            ).id
+            for idx in range(6)
+        ]
+        url = f'/api/v1/titles/{title.id}/reviews/?pagination=cursor'
+        assert collect_pages(client, url) == [ids[:5], ids[5:]], (
+            'Проверьте, что курсорный режим списка отзывов отдаёт '
+            'отзывы по возрастанию `pub_date`.'
+        )
+        assert client.get(
+            f'/api/v1/titles/{title.id}/reviews/').json()['count'] == 6
@@ -0,0 +1,191 @@
+import time
+from io import StringIO
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    def test_01_category_list_cache(self, client, admin_client):
+        url = '/api/v1/categories/'
+        assert client.get(url)['X-Cache'] == 'MISS'
+        response = client.get(url)
+        assert response['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{url}` '
+            'обслуживается из кэша.'
+        )
+        assert response.json()['count'] == 0
+
+        admin_client.post(url, data={'name': 'Фильм', 'slug': 'movie'})
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что создание категории сбрасывает кэш '
+            f'ответов `{url}`.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_02_title_invalidated_by_review(self, client, user_client):
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/'
+        assert client.get(url).json()['rating'] is None
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        user_client.post(
+            f'{url}reviews/', data={'text': 'text', 'score': 7})
+        assert client.get(url).json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш ответов '
+            'произведения.'
+        )
+
+    def test_03_cache_stats(self, client, admin_client, user_client):
+        url = '/api/v1/_cache/'
+        client.get('/api/v1/genres/')
+        client.get('/api/v1/genres/')
+        assert user_client.get(url).status_code == 403
+        stats = admin_client.get(url).json()
+        assert stats['genres']['hits'] >= 1
+        assert stats['genres']['misses'] >= 1
+
+    def test_04_conditional_get(self, client, user_client):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = client.get(url)
+        etag = response['ETag']
+        assert etag and response['Last-Modified'], (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'заголовки `ETag` и `Last-Modified`.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert not context.captured_queries, (
+            'Проверьте, что ответ 304 отдаётся без запросов к БД.'
+        )
+
+        user_client.post(url, data={'text': 'text', 'score': 7})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что новый отзыв меняет `ETag` списка отзывов.'
+        )
+        assert response.json()['count'] == 1
+
+    def test_05_version_expires(self, client, settings):
+        from api import cache
+
+        settings.API_CACHE_VERSION_TIMEOUT = 1
+        cache.bump_version('categories')
+        url = '/api/v1/categories/'
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        time.sleep(1.1)
+        assert cache.get_cache().get(
+            cache.VERSION_KEY.format(namespace='categories')) is None, (
+            'Проверьте, что версия пространства кэша хранится с '
+            'ограниченным временем жизни.'
+        )
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_06_commands_reset_cache(self, client):
+        from django.core.management import call_command
+        from reviews.models import Category
+
+        url = '/api/v1/categories/?title_count=true'
+        Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.update(title_count=3)
+        client.get(url)
+        assert client.get(url)['X-Cache'] == 'HIT'
+        call_command('reconcile_counters', stdout=StringIO())
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что `reconcile_counters` сбрасывает кэш ответов.'
+        )
+        assert response.json()['results'][0]['title_count'] == 0
+
+    def test_07_bump_after_commit(self, client, admin):
+        from django.db import transaction
+
+        from api import cache
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = f'/api/v1/titles/{title.id}/'
+        client.get(url)
+        version = cache.get_version('titles')
+        with transaction.atomic():
+            Review.objects.create(
+                title=title, author=admin, text='text', score=9)
+            assert cache.get_version('titles') == version, (
+                'Проверьте, что версия кэша сдвигается только после '
+                'фиксации транзакции, а не внутри неё.'
+            )
+        assert cache.get_version('titles') != version
+        response = client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 9
+
+    def test_08_receivers_per_model(self, admin, monkeypatch):
+        from django.db.models.signals import post_delete, post_save
+
+        from api import cache
+        from reviews.models import Comment, OutboxMessage, Review, Title
+
+        assert not post_delete.has_listeners(OutboxMessage), (
+            'Проверьте, что приёмники кэша подключены только к своим '
+            'моделям и не отключают быстрое удаление остальных.'
+        )
+        assert not post_save.has_listeners(OutboxMessage)
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='text', score=9)
+        for number in range(3):
+            Comment.objects.create(
+                review=review, author=admin, text=f'Комментарий {number}')
+        calls = []
+        bump_version = cache.bump_version
+        monkeypatch.setattr(
+            cache, 'bump_version',
+            lambda *namespaces: calls.append(namespaces)
+            or bump_version(*namespaces))
+        title.delete()
+        assert len(calls) == 1, (
+            'Проверьте, что каскадное удаление сдвигает версии кэша '
+            'один раз за транзакцию.'
+        )
+        assert {'titles', 'reviews', 'comments'} <= set(calls[0])
+
+    def test_09_user_writes_keep_review_cache(self, client, admin):
+        from reviews.models import Review, Title, User
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=admin, text='text', score=9)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        etag = client.get(url)['ETag']
+
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'})
+        user = User.objects.get(username='newcomer')
+        client.post('/api/v1/auth/token/', data={
+            'username': 'newcomer',
+            'confirmation_code': user.confirmation_code})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что регистрация и выдача токена не сбрасывают '
+            'кэш отзывов.'
+        )
+
+        admin.refresh_from_db()
+        admin.username = 'renamed'
+        admin.save()
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что смена имени автора сбрасывает кэш отзывов.'
+        )
+        assert response.json()['results'][0]['author'] == 'renamed'
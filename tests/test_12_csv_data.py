@@ -0,0 +1,119 @@
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12CsvData:
+
+    def check_loaded(self):
+        from reviews.models import Comment, Review, Title, TitleGenre, User
+
+        assert User.objects.count() == 5
+        assert TitleGenre.objects.count() == 42
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        review = Review.objects.get(pk=1)
+        assert review.text.startswith('Ставлю десять звёзд!\n'), (
+            'Проверьте, что многострочные поля CSV загружаются целиком.'
+        )
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации берётся из CSV-файла.'
+        )
+        assert Title.objects.get(pk=1).rating == 10.0
+
+    def test_01_load_csv(self):
+        call_command('load_csv')
+        self.check_loaded()
+
+    def test_02_load_csv_workers(self):
+        from django.conf import settings
+        from reviews.csv_import import import_csv
+
+        import_csv(f'{settings.BASE_DIR}/static/data', workers=2,
+                   chunk_bytes=256)
+        call_command('rebuild_ratings')
+        self.check_loaded()
+
+    def test_03_record_ranges(self):
+        from django.conf import settings
+        from reviews.csv_import import record_ranges
+
+        path = f'{settings.BASE_DIR}/static/data/review.csv'
+        header, ranges = record_ranges(path, 256)
+        with open(path, 'rb') as table:
+            content = table.read()
+        assert header == content[:len(header)]
+        assert ranges[0][0] == len(header)
+        assert ranges[-1][1] == len(content)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert content[start - 1:start] == b'\n'
+
+    def test_04_export_endpoint(self, user_client, admin_client,
+                                admin, user):
+        import json
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=user, text='Многострочный,\n"отзыв"',
+            score=7)
+        Comment.objects.create(review=review, author=admin, text='text')
+        url = '/api/v1/export/reviews/'
+        assert user_client.get(url).status_code == 403, (
+            f'Проверьте, что `{url}` доступен только администратору.'
+        )
+        response = admin_client.get(url)
+        assert response.status_code == 200
+        content = b''.join(response.streaming_content).decode()
+        assert content.startswith(
+            'id,title_id,text,author,score,pub_date\r\n'
+            f'{review.id},{title.id},"Многострочный,\n""отзыв""",'
+            f'{user.id},7,'
+        )
+
+        response = admin_client.get(
+            '/api/v1/export/comments/?output=ndjson')
+        rows = [
+            json.loads(line) for line in
+            b''.join(response.streaming_content).decode().splitlines()
+        ]
+        assert rows == [{
+            'id': review.comments.get().id, 'review_id': review.id,
+            'text': 'text', 'author': admin.id,
+            'pub_date': rows[0]['pub_date'],
+        }]
+
+    def test_05_export_round_trip(self, tmp_path):
+        from reviews.csv_import import load_table, read_rows
+        from reviews.models import Review
+
+        call_command('load_csv')
+        fields = ('id', 'title_id', 'text', 'author_id', 'score', 'pub_date')
+        exported = list(Review.objects.order_by('id').values_list(*fields))
+        path = str(tmp_path / 'review.csv')
+        call_command('export_data', 'reviews', file=path)
+
+        Review.objects.all().delete()
+        load_table(Review, read_rows(path, Review))
+        assert list(
+            Review.objects.order_by('id').values_list(*fields)
+        ) == exported, (
+            'Проверьте, что выгрузка `export_data` загружается обратно '
+            'командой `load_csv` без потерь.'
+        )
+
+    def test_06_blank_lines(self, tmp_path):
+        from reviews.csv_import import load_table, read_rows
+        from reviews.models import Category
+
+        path = tmp_path / 'category.csv'
+        path.write_text(
+            'id,name,slug\n1,Фильм,movie\n\n2,Книга,book\n\n',
+            encoding='utf-8')
+        load_table(Category, read_rows(str(path), Category))
+        assert list(Category.objects.order_by('id').values_list(
+            'slug', flat=True)) == ['movie', 'book'], (
+            'Проверьте, что пустые строки CSV пропускаются, как и при '
+            'параллельной загрузке.'
+        )
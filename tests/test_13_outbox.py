@@ -0,0 +1,56 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+
+
+class FailingBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13Outbox:
+
+    def signup(self, client):
+        response = client.post('/api/v1/auth/signup/', data={
+            'email': 'valid@yamdb.fake', 'username': 'valid-username'})
+        assert response.status_code == 200
+
+    def test_01_signup_only_enqueues(self, client, settings):
+        from reviews.models import OutboxMessage
+
+        settings.EMAIL_OUTBOX_DISPATCH = 'command'
+        outbox_before = len(mail.outbox)
+        self.signup(client)
+        assert len(mail.outbox) == outbox_before, (
+            'Проверьте, что регистрация только ставит письмо в очередь.'
+        )
+        message = OutboxMessage.objects.get()
+        assert message.sent_at is None
+
+        call_command('process_outbox')
+        message.refresh_from_db()
+        assert message.sent_at is not None
+        assert len(mail.outbox) == outbox_before + 1
+        assert mail.outbox[-1].to == ['valid@yamdb.fake']
+
+    def test_02_failed_delivery_is_retried(self, client, settings):
+        from django.utils import timezone
+        from reviews.models import OutboxMessage
+
+        settings.EMAIL_OUTBOX_DISPATCH = 'command'
+        settings.EMAIL_BACKEND = 'tests.test_13_outbox.FailingBackend'
+        self.signup(client)
+        call_command('process_outbox')
+        message = OutboxMessage.objects.get()
+        assert (message.sent_at, message.attempts) == (None, 1)
+        assert 'SMTP' in message.last_error
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        OutboxMessage.objects.update(next_attempt=timezone.now())
+        call_command('process_outbox')
+        message.refresh_from_db()
+        assert message.sent_at is not None, (
+            'Проверьте, что неотправленное письмо отправляется повторно.'
+        )
@@ -0,0 +1,105 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def token_client(user):
+    from api.authentication import access_token_for
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {access_token_for(user)}')
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TokenClaims:
+
+    def test_01_get_token_claims(self, client, django_user_model):
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        user = django_user_model.objects.create(
+            username='TestUser', email='testuser@yamdb.fake',
+            role='moderator', confirmation_code='code')
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': 'code'})
+        token = AccessToken(response.json()['token'])
+        user.refresh_from_db()
+        assert token['role'] == 'moderator'
+        assert token['token_version'] == user.token_version
+
+    def test_02_no_user_query(self, admin):
+        client = token_client(admin)
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(
+                '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'f'})
+        assert response.status_code == 201
+        assert not any(
+            'reviews_user' in query['sql']
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что для токена с ролью пользователь не '
+            'загружается из БД.'
+        )
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['bio'] == admin.bio
+
+    def test_03_role_change_revokes_claims(self, admin):
+        client = token_client(admin)
+        assert client.get('/api/v1/users/').status_code == 200
+
+        admin.role = 'user'
+        admin.save()
+        assert client.get('/api/v1/users/').status_code == 403, (
+            'Проверьте, что после смены роли токен со старой ролью '
+            'не даёт прежних прав.'
+        )
+
+    def test_04_rename_revokes_claims(self, admin_client, user):
+        from reviews.models import Title
+
+        client = token_client(user)
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'})
+        assert response.status_code == 200
+        user.refresh_from_db()
+        assert user.token_version == 1, (
+            'Проверьте, что смена username увеличивает `token_version`.'
+        )
+        title = Title.objects.create(name='Побег', year=1994)
+        response = client.post(
+            f'/api/v1/titles/{title.pk}/reviews/',
+            data={'text': 'Отзыв', 'score': 7})
+        assert response.json()['author'] == 'renamed', (
+            'Проверьте, что токен со старым username не подставляет '
+            'прежнее имя автора.'
+        )
+
+    def test_05_delete_revokes_claims(self, admin_client, user):
+        from reviews.models import Title
+
+        client = token_client(user)
+        assert client.get('/api/v1/users/me/').status_code == 200
+        title = Title.objects.create(name='Побег', year=1994)
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        response = client.post(
+            f'/api/v1/titles/{title.pk}/reviews/',
+            data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == 401, (
+            'Проверьте, что токен удалённого пользователя больше '
+            'не принимается.'
+        )
+        assert client.get('/api/v1/users/me/').status_code == 401
+
+    def test_06_db_user_missing(self, user):
+        from rest_framework.exceptions import AuthenticationFailed
+
+        from api.authentication import get_db_user
+        from reviews.models import User
+
+        token_user = User(pk=user.pk + 100, username='ghost')
+        token_user.is_token_user = True
+        with pytest.raises(AuthenticationFailed):
+            get_db_user(token_user)
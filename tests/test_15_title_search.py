@@ -0,0 +1,49 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleSearch:
+
+    def search(self, client, query):
+        response = client.get('/api/v1/titles/', {'search': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_ranking_and_sync(self, client, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        Title.objects.create(
+            name='Побег', year=1994,
+            description='Тюремная драма о надежде и дружбе')
+        title = Title.objects.create(
+            name='Драма у моря', year=2000, category=category)
+        Title.objects.create(name='Крестный отец', year=1972)
+
+        assert self.search(client, 'драм') == ['Драма у моря', 'Побег'], (
+            'Проверьте, что `?search=` ищет по названию и описанию и '
+            'ставит совпадения в названии выше.'
+        )
+        assert self.search(client, 'фильм') == ['Драма у моря']
+
+        title.genre.add(drama)
+        drama.name = 'Триллер'
+        drama.save()
+        assert self.search(client, 'триллер') == ['Драма у моря'], (
+            'Проверьте, что индекс обновляется при изменении жанров.'
+        )
+
+        title.delete()
+        assert self.search(client, 'фильм') == []
+        assert self.search(client, 'отец') == ['Крестный отец']
+
+    def test_02_search_with_filters(self, client):
+        from reviews.models import Title
+
+        Title.objects.create(name='Война и мир', year=1869)
+        Title.objects.create(name='Война миров', year=1898)
+        response = client.get('/api/v1/titles/?search=война&year=1898')
+        data = response.json()
+        assert data['count'] == 1
+        assert data['results'][0]['name'] == 'Война миров'
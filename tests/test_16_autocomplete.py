@@ -0,0 +1,96 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16Autocomplete:
+
+    def names(self, client, kind, query, **params):
+        response = client.get(
+            f'/api/v1/autocomplete/{kind}/', {'q': query, **params})
+        assert response.status_code == 200
+        return [item.get('name') or item.get('username')
+                for item in response.json()['results']]
+
+    def test_01_genres(self, client, admin_client):
+        from reviews.models import Genre
+
+        for name, slug in (('Драма', 'drama'), ('Мелодрама', 'melodrama'),
+                           ('Детектив', 'detective'), ('Джаз', 'jazz')):
+            Genre.objects.create(name=name, slug=slug)
+        assert self.names(client, 'genres', 'д') == [
+            'Детектив', 'Джаз', 'Драма'], (
+            'Проверьте, что подсказки по префиксу отсортированы по имени.'
+        )
+        assert self.names(client, 'genres', 'драм') == [
+            'Драма', 'Мелодрама'], (
+            'Проверьте, что после совпадений по префиксу идут совпадения '
+            'внутри названия.'
+        )
+        assert self.names(client, 'genres', 'д', limit=1) == ['Детектив']
+
+        admin_client.post(
+            '/api/v1/genres/', data={'name': 'Драмеди', 'slug': 'dramedy'})
+        admin_client.delete('/api/v1/genres/drama/')
+        assert self.names(client, 'genres', 'драм') == [
+            'Драмеди', 'Мелодрама'], (
+            'Проверьте, что индекс обновляется при изменении жанров.'
+        )
+
+    def test_02_users_admin_only(self, client, user_client, admin_client,
+                                 admin, user):
+        url = '/api/v1/autocomplete/users/?q=test'
+        assert client.get(url).status_code in (401, 403)
+        assert user_client.get(url).status_code == 403
+        assert self.names(admin_client, 'users', 'testa') == ['TestAdmin']
+        assert admin_client.get(
+            '/api/v1/autocomplete/titles/').status_code == 404
+
+    def test_03_no_rebuild_on_unrelated_writes(self, client, monkeypatch):
+        from api import autocomplete, cache
+        from reviews.models import Category, Genre, Title
+
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        index = autocomplete.INDEXES['genres']
+        assert self.names(client, 'genres', 'др') == ['Драма']
+        rebuilds = []
+        rebuild = index.rebuild
+        monkeypatch.setattr(
+            index, 'rebuild', lambda: rebuilds.append(1) or rebuild())
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Title.objects.create(
+            name='Побег', year=1994, category=category).genre.add(genre)
+        assert self.names(client, 'genres', 'др') == ['Драма']
+        assert not rebuilds, (
+            'Проверьте, что запись произведения не перестраивает индекс '
+            'автодополнения жанров.'
+        )
+
+        cache.bump_version(index.namespace)
+        assert self.names(client, 'genres', 'др') == ['Драма']
+        assert rebuilds == [1], (
+            'Проверьте, что индекс перестраивается после записи жанра '
+            'в другом процессе.'
+        )
+
+    def test_04_user_saves_keep_version(self, client, admin_client, admin):
+        from api import autocomplete, cache
+        from reviews.models import User
+
+        index = autocomplete.INDEXES['users']
+        User.objects.filter(pk=admin.pk).update(confirmation_code='code')
+        version = cache.get_version(index.namespace)
+        response = client.post('/api/v1/auth/token/', data={
+            'username': admin.username, 'confirmation_code': 'code'})
+        assert response.status_code == 200
+        user = User.objects.get(pk=admin.pk)
+        user.bio = 'Новая биография'
+        user.save()
+        assert cache.get_version(index.namespace) == version, (
+            'Проверьте, что запись пользователя без смены имени не '
+            'сбрасывает индекс автодополнения пользователей.'
+        )
+        user.username = 'Renamed'
+        user.save()
+        assert cache.get_version(index.namespace) != version
+        assert self.names(admin_client, 'users', 'renam') == ['Renamed']
@@ -0,0 +1,50 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17IndexAdvisor:
+
+    def test_01_composite_indexes(self):
+        expected = {
+            'reviews_review': ['title_id', 'pub_date'],
+            'reviews_comment': ['review_id', 'pub_date'],
+            'reviews_titlegenre': ['genre_id', 'title_id'],
+            'reviews_title': ['year'],
+        }
+        with connection.cursor() as cursor:
+            for table, columns in expected.items():
+                constraints = connection.introspection.get_constraints(
+                    cursor, table)
+                assert any(
+                    constraint['index'] and constraint['columns'] == columns
+                    for constraint in constraints.values()
+                ), f'Проверьте, что для `{table}` создан индекс {columns}.'
+
+    def test_02_no_full_scans(self):
+        out = StringIO()
+        call_command('index_advisor', '--fail-on-scan', stdout=out)
+        output = out.getvalue()
+        assert 'titles/{id}/reviews' in output
+        assert 'FULL SCAN' not in output, (
+            'Проверьте, что основные запросы API используют индексы.'
+        )
+
+    def test_03_index_scan_reported(self, monkeypatch):
+        from reviews.management.commands import index_advisor
+        from reviews.models import Category
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('Формат плана проверяется только для SQLite.')
+        monkeypatch.setattr(index_advisor, 'canonical_queries', lambda: (
+            ('categories', Category.objects.order_by('name')[:10], False),
+        ))
+        out = StringIO()
+        call_command('index_advisor', stdout=out)
+        assert 'FULL SCAN' in out.getvalue() and 'USING' in out.getvalue(), (
+            'Проверьте, что `SCAN <таблица> USING INDEX` тоже считается '
+            'полным просмотром.'
+        )
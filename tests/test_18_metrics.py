@@ -0,0 +1,48 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Metrics:
+
+    @pytest.fixture(autouse=True)
+    def enable_metrics(self, settings):
+        settings.API_METRICS = True
+
+    def test_01_server_timing(self, client):
+        response = client.get('/api/v1/titles/')
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'db-slowest;dur=', 'serialize;dur=',
+                       'total;dur='):
+            assert metric in timing, (
+                f'Проверьте, что заголовок Server-Timing содержит `{metric}`.'
+            )
+
+    def test_02_metrics_endpoint(self, client, user_client, admin_client):
+        from api import metrics
+        from reviews.models import Title
+
+        metrics.reset()
+        Title.objects.create(name='Побег', year=1994)
+        for _ in range(3):
+            client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/1/')
+
+        assert client.get('/api/v1/_metrics/').status_code == 401
+        assert user_client.get('/api/v1/_metrics/').status_code == 403
+        stats = admin_client.get('/api/v1/_metrics/').json()
+        assert stats['TitleViewSet.list']['count'] == 3, (
+            'Проверьте, что метрики группируются по имени представления.'
+        )
+        assert 'TitleViewSet.retrieve' in stats
+        queries = stats['TitleViewSet.list']['queries']
+        assert set(queries) == {'p50', 'p95', 'p99'}
+        assert queries['p99'] >= 1
+        assert 'reviews_title' in (
+            stats['TitleViewSet.list']['slowest_sql']['sql'])
+
+    def test_03_disabled(self, client, settings):
+        settings.API_METRICS = False
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Проверьте, что при `API_METRICS=False` метрики не собираются.'
+        )
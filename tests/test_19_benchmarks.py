@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19Benchmarks:
+
+    def test_01_seed_and_run(self):
+        from benchmarks.flows import FLOWS
+        from benchmarks.runner import compare, run
+        from benchmarks.seed import seed
+        from reviews.models import Comment, Review, Title
+
+        data = seed(titles=5, reviews=20, comments=30, report=lambda _: None)
+        assert Title.objects.count() == 5
+        assert Review.objects.count() == 20
+        assert Comment.objects.count() == 30
+        assert Title.objects.filter(review_count=4).count() == 5, (
+            'Проверьте, что после засева пересчитаны счётчики отзывов.'
+        )
+
+        results = run(data, iterations=3)
+        assert set(results) == set(FLOWS)
+        for result in results.values():
+            assert {'rps', 'p50_ms', 'p95_ms', 'p99_ms',
+                    'queries'} <= set(result)
+
+        baseline = {
+            'review_list': dict(results['review_list'], max_queries=0)}
+        assert compare(results, baseline, tolerance=0.25), (
+            'Проверьте, что рост числа запросов считается регрессией.'
+        )
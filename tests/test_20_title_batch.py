@@ -0,0 +1,71 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleBatch:
+
+    def create_titles(self, count):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [Genre.objects.create(name=f'Жанр {index}', slug=f'g{index}')
+                  for index in range(2)]
+        titles = []
+        for index in range(count):
+            title = Title.objects.create(
+                name=f'Произведение {index}', year=2000, category=category)
+            title.genre.set(genres)
+            titles.append(title)
+        return titles
+
+    def test_01_order_and_missing(self, client):
+        titles = self.create_titles(3)
+        ids = [titles[2].pk, 999, titles[0].pk, titles[2].pk]
+        response = client.get(
+            '/api/v1/titles/batch/', {'ids': ','.join(map(str, ids))})
+        assert response.status_code == 200
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[2].pk, titles[0].pk], (
+            'Проверьте, что произведения возвращаются в порядке запроса.'
+        )
+        assert data['missing'] == [999]
+        result = data['results'][0]
+        assert result['category'] == {'name': 'Фильм', 'slug': 'movie'}
+        assert len(result['genre']) == 2
+        assert 'rating' in result
+
+        response = client.post(
+            '/api/v1/titles/batch/', data={'ids': ids},
+            content_type='application/json')
+        assert response.status_code == 200
+        assert response.json()['missing'] == [999]
+
+    def test_02_constant_queries(self, client):
+        titles = self.create_titles(30)
+
+        def count_queries(ids):
+            with CaptureQueriesContext(connection) as context:
+                response = client.post(
+                    '/api/v1/titles/batch/', data={'ids': ids},
+                    content_type='application/json')
+            assert response.status_code == 200
+            return len(context.captured_queries)
+
+        assert count_queries([titles[0].pk]) == count_queries(
+            [title.pk for title in titles]), (
+            'Проверьте, что число запросов не зависит от числа произведений.'
+        )
+
+    def test_03_validation(self, client):
+        assert client.get('/api/v1/titles/batch/').status_code == 400
+        assert client.get(
+            '/api/v1/titles/batch/?ids=1,abc').status_code == 400
+        response = client.post(
+            '/api/v1/titles/batch/', data={'ids': list(range(1, 302))},
+            content_type='application/json')
+        assert response.status_code == 400, (
+            'Проверьте, что число id в одном запросе ограничено.'
+        )
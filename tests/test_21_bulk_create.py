@@ -0,0 +1,122 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21BulkCreate:
+
+    def create_title(self):
+        from reviews.models import Title
+
+        return Title.objects.create(name='Побег', year=1994)
+
+    def create_authors(self, count):
+        from reviews.models import User
+
+        return [
+            User.objects.create(
+                username=f'author{index}', email=f'a{index}@yamdb.fake')
+            for index in range(count)
+        ]
+
+    def test_01_bulk_reviews(self, admin_client):
+        from reviews.models import Title
+
+        title = self.create_title()
+        authors = self.create_authors(3)
+        url = f'/api/v1/titles/{title.pk}/reviews/bulk/'
+        data = [{'author': author.username, 'text': 'Отзыв', 'score': score}
+                for author, score in zip(authors, (4, 8, 8))]
+        response = admin_client.post(
+            url, data=json.dumps(data), content_type='application/json')
+        assert response.status_code == 201, response.json()
+        created = response.json()
+        assert [review['author'] for review in created] == [
+            author.username for author in authors]
+        assert all(review['id'] and review['pub_date'] for review in created)
+        title = Title.objects.get(pk=title.pk)
+        assert (title.review_count, title.score_sum, title.score_8) == (
+            3, 20, 2), (
+            'Проверьте, что массовое создание отзывов обновляет счётчики '
+            'произведения.'
+        )
+        response = admin_client.get(f'/api/v1/titles/{title.pk}/reviews/')
+        assert response.json()['count'] == 3
+
+    def test_02_constant_validation_queries(self, admin_client):
+        title = self.create_title()
+        authors = self.create_authors(20)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+
+        def count_queries(batch):
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(
+                    f'{url}bulk/', content_type='application/json',
+                    data=json.dumps([
+                        {'author': author.username, 'text': 'Т', 'score': 5}
+                        for author in batch
+                    ]))
+            assert response.status_code == 201
+            return len(context.captured_queries)
+
+        assert count_queries(authors[:2]) == count_queries(authors[2:]), (
+            'Проверьте, что число запросов не зависит от размера пачки.'
+        )
+
+    def test_03_duplicates(self, admin_client, admin):
+        from reviews.models import Review
+
+        title = self.create_title()
+        (author,) = self.create_authors(1)
+        url = f'/api/v1/titles/{title.pk}/reviews/bulk/'
+        response = admin_client.post(
+            url, content_type='application/json', data=json.dumps(
+                [{'author': author.username, 'text': 'Т', 'score': 5}] * 2))
+        assert response.status_code == 400
+        assert response.json()[0] == {}
+        assert 'author' in response.json()[1], (
+            'Проверьте, что повтор автора внутри пачки — ошибка.'
+        )
+        admin_client.post(f'/api/v1/titles/{title.pk}/reviews/',
+                          data={'text': 'Т', 'score': 5})
+        response = admin_client.post(
+            url, content_type='application/json', data=json.dumps([
+                {'author': author.username, 'text': 'Т', 'score': 5},
+                {'text': 'Т', 'score': 5},
+            ]))
+        assert response.status_code == 400
+        assert 'author' in response.json()[1], (
+            'Проверьте, что уже существующий отзыв автора — ошибка.'
+        )
+        assert Review.objects.count() == 1
+
+    def test_04_bulk_comments(self, admin, user_client, user):
+        from reviews.models import Review
+
+        title = self.create_title()
+        review = Review.objects.create(
+            title=title, author=admin, text='Т', score=5)
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        response = user_client.post(
+            f'{url}bulk/', content_type='application/json',
+            data=json.dumps([{'text': 'Первый'}, {'text': 'Второй'}]))
+        assert response.status_code == 201
+        assert [comment['author'] for comment in response.json()] == [
+            user.username] * 2
+        assert user_client.get(url).json()['count'] == 2
+
+        response = user_client.post(
+            f'{url}bulk/', content_type='application/json',
+            data=json.dumps([{'text': 'Т', 'author': admin.username}]))
+        assert response.status_code == 403, (
+            'Проверьте, что указать чужого автора может только '
+            'администратор или модератор.'
+        )
+        response = user_client.post(
+            f'/api/v1/titles/999/reviews/{review.pk}/comments/bulk/',
+            content_type='application/json',
+            data=json.dumps([{'text': 'Т'}]))
+        assert response.status_code == 404
@@ -0,0 +1,93 @@
+import threading
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Database:
+
+    def test_01_sqlite_connection_settings(self):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Настройки SQLite')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что для SQLite задан synchronous=NORMAL.'
+            )
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == 5000
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                connection.cursor().execute('SELECT 1')
+        assert context.captured_queries[0]['sql'] == 'BEGIN IMMEDIATE', (
+            'Проверьте, что транзакции SQLite сразу берут блокировку записи.'
+        )
+
+    def test_02_concurrent_writers(self, tmp_path):
+        if connection.vendor != 'sqlite':
+            pytest.skip('Настройки SQLite')
+        from api_yamdb.backends.sqlite3.base import DatabaseWrapper
+
+        settings_dict = {
+            **connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')}
+        setup = DatabaseWrapper(settings_dict, 'concurrent')
+        with setup.cursor() as cursor:
+            cursor.execute('CREATE TABLE counter (value INTEGER)')
+        setup.close()
+        errors = []
+
+        def worker():
+            db = DatabaseWrapper(settings_dict, 'concurrent')
+            try:
+                for _ in range(25):
+                    db._start_transaction_under_autocommit()
+                    with db.cursor() as cursor:
+                        cursor.execute('SELECT COUNT(*) FROM counter')
+                        count = cursor.fetchone()[0]
+                        cursor.execute(
+                            'INSERT INTO counter VALUES (%s)', [count])
+                        cursor.execute('COMMIT')
+            except Exception as error:
+                errors.append(error)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, (
+            'Проверьте, что параллельные записи ждут блокировку, а не '
+            f'падают: {errors[:1]}'
+        )
+        with setup.cursor() as cursor:
+            cursor.execute('SELECT COUNT(DISTINCT value) FROM counter')
+            assert cursor.fetchone()[0] == 100
+            cursor.execute('PRAGMA journal_mode')
+            assert cursor.fetchone()[0] == 'wal'
+        setup.close()
+
+    def test_03_stock_sqlite_engine(self, tmp_path, monkeypatch):
+        import runpy
+
+        from django.conf import settings
+        from django.db.backends.sqlite3.base import DatabaseWrapper
+
+        monkeypatch.setenv('DB_ENGINE', 'django.db.backends.sqlite3')
+        monkeypatch.setenv('DB_NAME', str(tmp_path / 'db.sqlite3'))
+        module = runpy.run_path(
+            str(settings.BASE_DIR) + '/api_yamdb/settings.py')
+        database = module['DATABASES']['default']
+        assert 'OPTIONS' not in database and 'HOST' not in database, (
+            'Проверьте, что стандартный бэкенд sqlite3 не получает '
+            'параметры своего бэкенда и PostgreSQL.'
+        )
+        db = DatabaseWrapper(
+            {**connection.settings_dict, **database, 'OPTIONS': {}},
+            'stock')
+        with db.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        db.close()
@@ -0,0 +1,86 @@
+import pytest
+from django.test import override_settings
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23FastRead:
+
+    def fetch(self, client, url, fast):
+        from api import cache
+
+        cache.get_cache().clear()
+        names = (['TitleViewSet', 'ReviewViewSet', 'CommentViewSet']
+                 if fast else [])
+        with override_settings(API_FAST_READ=names):
+            response = client.get(url)
+        assert response.status_code == 200
+        return response.content
+
+    def test_01_byte_compatible(self, client, admin, user):
+        from reviews.models import (Category, Comment, Genre, Review,
+                                    Title)
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [Genre.objects.create(name=name, slug=slug) for name, slug
+                  in (('Драма', 'drama'), ('Комедия', 'comedy'))]
+        title = Title.objects.create(
+            name='Драма «Побег» ', year=1994, category=category,
+            description='Тюремная драма')
+        title.genre.set(genres)
+        Title.objects.create(name='Без категории', year=2000)
+        for author, score in ((admin, 7), (user, 8)):
+            review = Review.objects.create(
+                title=title, author=author, text='Отзыв "в кавычках"',
+                score=score)
+        Comment.objects.create(review=review, author=admin, text='Ответ')
+
+        reviews_url = f'/api/v1/titles/{title.pk}/reviews/'
+        for url in ('/api/v1/titles/',
+                    '/api/v1/titles/?genre=drama',
+                    '/api/v1/titles/?search=драма',
+                    '/api/v1/titles/?pagination=cursor',
+                    reviews_url,
+                    f'{reviews_url}?pagination=cursor',
+                    f'{reviews_url}{review.pk}/comments/'):
+            assert (self.fetch(client, url, fast=True)
+                    == self.fetch(client, url, fast=False)), (
+                f'Проверьте, что быстрый путь для `{url}` отдаёт те же '
+                'байты, что и сериализатор.'
+            )
+
+    def test_02_switchable(self, client, monkeypatch):
+        from api.fast import TitleRows
+
+        calls = []
+        to_representation = TitleRows.to_representation
+
+        def spy(self, rows):
+            calls.append(len(rows))
+            return to_representation(self, rows)
+
+        monkeypatch.setattr(TitleRows, 'to_representation', spy)
+        self.fetch(client, '/api/v1/titles/', fast=False)
+        assert not calls
+        self.fetch(client, '/api/v1/titles/', fast=True)
+        assert calls, (
+            'Проверьте, что быстрый путь включается настройкой '
+            '`API_FAST_READ`.'
+        )
+
+    def test_03_orjson_used(self, client, monkeypatch):
+        from api import renderers
+
+        assert renderers.orjson is not None, (
+            'Установите `orjson` из requirements.txt: без него быстрый '
+            'путь кодирует ответы стандартным JSONRenderer.'
+        )
+        calls = []
+        dumps = renderers.orjson.dumps
+        monkeypatch.setattr(
+            renderers, 'orjson',
+            type('Spy', (), {'dumps': staticmethod(
+                lambda data: calls.append(1) or dumps(data))}))
+        self.fetch(client, '/api/v1/titles/', fast=True)
+        assert calls, (
+            'Проверьте, что ответы быстрого пути кодируются через orjson.'
+        )
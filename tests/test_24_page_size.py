@@ -0,0 +1,116 @@
+import json
+from io import StringIO
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24PageSize:
+
+    def count_queries(self, sql_list):
+        return [sql for sql in sql_list if 'COUNT(' in sql.upper()]
+
+    def create_comments(self, admin, count):
+        from reviews.models import Comment, Review, Title
+
+        title = Title.objects.create(name='Побег', year=1994)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9)
+        for number in range(count):
+            Comment.objects.create(
+                review=review, author=admin, text=f'Комментарий {number}')
+        return title, review
+
+    def test_01_page_size_capped(self, client, monkeypatch):
+        from api import cache
+        from api.pagination import SizedPagination
+        from reviews.models import Title
+
+        cache.get_cache().clear()
+        for number in range(7):
+            Title.objects.create(name=f'Произведение {number}', year=2000)
+        data = client.get('/api/v1/titles/?page_size=6').json()
+        assert data['count'] == 7 and len(data['results']) == 6, (
+            'Проверьте, что параметр `page_size` задаёт размер страницы.'
+        )
+        assert 'page_size=6' in data['next']
+
+        monkeypatch.setattr(SizedPagination, 'max_page_size', 3)
+        data = client.get('/api/v1/titles/?page_size=1000').json()
+        assert len(data['results']) == 3, (
+            'Проверьте, что `page_size` ограничен `max_page_size`.'
+        )
+        data = client.get(
+            '/api/v1/titles/?page_size=2&pagination=cursor').json()
+        assert len(data['results']) == 2, (
+            'Проверьте, что `page_size` работает и в курсорном режиме.'
+        )
+
+    def test_02_skip_count(self, client, admin):
+        title, review = self.create_comments(admin, 3)
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(f'{url}?count=none&page_size=2')
+        data = response.json()
+        assert list(data) == ['next', 'previous', 'results'], (
+            'Проверьте, что с `?count=none` ответ не содержит `count`.'
+        )
+        assert len(data['results']) == 2 and data['next'] is not None
+        assert not self.count_queries([q['sql'] for q in queries]), (
+            'Проверьте, что с `?count=none` не выполняется COUNT(*).'
+        )
+        data = client.get(data['next']).json()
+        assert len(data['results']) == 1 and data['next'] is None
+        assert client.get(f'{url}?count=none&page=3').status_code == 404
+
+    def test_03_comment_count_from_counter(self, client, admin_client,
+                                           admin):
+        from django.core.management import call_command
+        from reviews.models import Comment, Review
+
+        title, review = self.create_comments(admin, 2)
+        url = f'/api/v1/titles/{title.pk}/reviews/{review.pk}/comments/'
+        response = admin_client.post(
+            f'{url}bulk/',
+            json.dumps([{'text': 'Первый'}, {'text': 'Второй'}]),
+            content_type='application/json'
+        )
+        assert response.status_code == 201
+        Comment.objects.filter(review=review).first().delete()
+        review.refresh_from_db()
+        assert review.comment_count == 3, (
+            'Проверьте, что `Review.comment_count` сдвигается при создании '
+            'и удалении комментариев.'
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(url).json()
+        assert data['count'] == 3
+        assert not self.count_queries([q['sql'] for q in queries]), (
+            'Проверьте, что список комментариев берёт `count` из счётчика '
+            'отзыва, а не из COUNT(*).'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            data = client.get(f'{url}?count=exact').json()
+        assert data['count'] == 3
+        assert self.count_queries([q['sql'] for q in queries])
+
+        stale = Review.objects.get(pk=review.pk)
+        Comment.objects.create(review=review, author=admin, text='Ещё')
+        stale.text = 'Исправленный отзыв'
+        stale.save()
+        review.refresh_from_db()
+        assert review.comment_count == 4, (
+            'Проверьте, что сохранение отзыва не перезаписывает счётчик '
+            'комментариев.'
+        )
+
+        Review.objects.filter(pk=review.pk).update(comment_count=0)
+        call_command('reconcile_counters', stdout=StringIO())
+        review.refresh_from_db()
+        assert review.comment_count == 4, (
+            'Проверьте, что `reconcile_counters` исправляет '
+            '`comment_count`.'
+        )
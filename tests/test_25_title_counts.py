@@ -0,0 +1,88 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TitleCounts:
+
+    def counts(self, model):
+        return dict(model.objects.values_list('slug', 'title_count'))
+
+    def test_01_counters_follow_writes(self):
+        from reviews.models import Category, Genre, Title, TitleGenre
+
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        book = Category.objects.create(name='Книга', slug='book')
+        drama, comedy = (Genre.objects.create(name=name, slug=slug)
+                         for name, slug in (('Драма', 'drama'),
+                                            ('Комедия', 'comedy')))
+        first = Title.objects.create(name='Побег', year=1994, category=movie)
+        second = Title.objects.create(name='Идиот', year=1869, category=book)
+        first.genre.set([drama, comedy])
+        TitleGenre.objects.create(title=second, genre=drama)
+        assert self.counts(Category) == {'movie': 1, 'book': 1}
+        assert self.counts(Genre) == {'drama': 2, 'comedy': 1}, (
+            'Проверьте, что `Genre.title_count` растёт при добавлении '
+            'произведения в жанр.'
+        )
+
+        second = Title.objects.get(pk=second.pk)
+        second.category = movie
+        second.save()
+        first.genre.remove(comedy, drama)
+        first.genre.add(comedy)
+        assert self.counts(Category) == {'movie': 2, 'book': 0}, (
+            'Проверьте, что смена категории произведения переносит '
+            'его в счётчик новой категории.'
+        )
+        assert self.counts(Genre) == {'drama': 1, 'comedy': 1}
+
+        first.genre.clear()
+        second.delete()
+        assert self.counts(Category) == {'movie': 1, 'book': 0}
+        assert self.counts(Genre) == {'drama': 0, 'comedy': 0}, (
+            'Проверьте, что удаление произведения и связей уменьшает '
+            'счётчики жанров.'
+        )
+
+    def test_02_title_count_opt_in(self, client, admin_client):
+        from api import cache
+        from reviews.models import Category, Title
+
+        cache.get_cache().clear()
+        category = Category.objects.create(name='Фильм', slug='movie')
+        assert client.get('/api/v1/categories/').json()['results'] == [
+            {'name': 'Фильм', 'slug': 'movie'}]
+        Title.objects.create(name='Побег', year=1994, category=category)
+        response = client.get('/api/v1/categories/?title_count=true')
+        assert response.json()['results'] == [
+            {'name': 'Фильм', 'slug': 'movie', 'title_count': 1}], (
+            'Проверьте, что `?title_count=true` добавляет счётчик '
+            'произведений и кэш сбрасывается при записи произведения.'
+        )
+        assert client.get('/api/v1/genres/?title_count=true').status_code \
+            == 200
+
+    def test_03_reconcile(self):
+        from reviews.models import Category, Genre, Title
+
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        Title.objects.create(
+            name='Побег', year=1994, category=category).genre.add(genre)
+        Category.objects.update(title_count=5)
+        Genre.objects.update(title_count=0)
+
+        out = StringIO()
+        call_command('reconcile_counters', '--dry-run', stdout=out)
+        assert 'category.title_count: расхождений 1' in out.getvalue()
+        assert self.counts(Category) == {'movie': 5}, (
+            'Проверьте, что `--dry-run` ничего не меняет.'
+        )
+        call_command('reconcile_counters', stdout=StringIO())
+        assert self.counts(Category) == {'movie': 1}
+        assert self.counts(Genre) == {'drama': 1}, (
+            'Проверьте, что `reconcile_counters` исправляет счётчики.'
+        )
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ExposedCounters:
+
+    def test_01_counts_in_responses(self, client, admin_client, admin,
+                                    user):
+        from api import cache
+        from reviews.models import Comment, Review, Title
+
+        cache.get_cache().clear()
+        title = Title.objects.create(name='Побег', year=1994)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9)
+        Review.objects.create(title=title, author=user, text='Ещё', score=7)
+        for text in ('Первый', 'Второй'):
+            Comment.objects.create(review=review, author=admin, text=text)
+
+        data = client.get(f'/api/v1/titles/{title.pk}/').json()
+        assert data['review_count'] == 2, (
+            'Проверьте, что произведение отдаёт поле `review_count`.'
+        )
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        results = client.get(url).json()['results']
+        assert {item['id']: item['comment_count'] for item in results} == {
+            review.pk: 2, review.pk + 1: 0}, (
+            'Проверьте, что отзыв отдаёт поле `comment_count`.'
+        )
+
+        comment_url = f'{url}{review.pk}/comments/'
+        response = admin_client.post(comment_url, data={'text': 'Третий'})
+        assert response.status_code == 201
+        comment_id = Comment.objects.filter(review=review).first().pk
+        response = admin_client.delete(f'{comment_url}{comment_id}/')
+        assert response.status_code == 204
+        data = client.get(f'{url}{review.pk}/').json()
+        assert data['comment_count'] == 2, (
+            'Проверьте, что создание и удаление комментария через API '
+            'сдвигают `comment_count`.'
+        )
+        response = admin_client.delete(f'{url}{review.pk}/')
+        assert response.status_code == 204
+        data = client.get(f'/api/v1/titles/{title.pk}/').json()
+        assert data['review_count'] == 1
+
+    def test_02_title_save_keeps_counters(self, admin):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Побег', year=1994)
+        stale = Title.objects.get(pk=title.pk)
+        Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9)
+        stale.name = 'Побег из Шоушенка'
+        stale.save()
+        title.refresh_from_db()
+        assert (title.name, title.review_count, title.score_9) == (
+            'Побег из Шоушенка', 1, 1), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'счётчики отзывов устаревшими значениями.'
+        )
+
+    def test_03_comment_write_changes_review_etag(self, client,
+                                                  admin_client, admin):
+        from reviews.models import Review, Title
+
+        title = Title.objects.create(name='Побег', year=1994)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=9)
+        url = f'/api/v1/titles/{title.pk}/reviews/'
+        comments_url = f'{url}{review.pk}/comments/'
+        for path, body, content_type in (
+                (comments_url, {'text': 'Первый'}, None),
+                (f'{comments_url}bulk/', json.dumps([{'text': 'Второй'}]),
+                 'application/json')):
+            etag = client.get(url)['ETag']
+            kwargs = {'content_type': content_type} if content_type else {}
+            assert admin_client.post(path, body, **kwargs).status_code == 201
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200, (
+                'Проверьте, что запись комментария меняет ETag списка '
+                'отзывов: в нём отдаётся `comment_count`.'
+            )
+        assert response.json()['results'][0]['comment_count'] == 2
@@ -0,0 +1,161 @@
+import json
+from io import StringIO
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TopTitles:
+
+    def create_titles(self, admin, user):
+        from reviews.models import Category, Genre, Review, Title
+
+        movie = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        titles = [
+            Title.objects.create(name=name, year=2000, category=category)
+            for name, category in (('Первое', movie), ('Второе', movie),
+                                   ('Третье', None))
+        ]
+        titles[0].genre.add(drama)
+        for title, scores in zip(titles, ((6, 8), (10,), (9, 9))):
+            for author, score in zip((admin, user), scores):
+                Review.objects.create(
+                    title=title, author=author, text='Отзыв', score=score)
+        return titles
+
+    def ids(self, data):
+        return [item['id'] for item in data['results']]
+
+    def test_01_top_by_window(self, client, admin, user):
+        from api import cache
+        from reviews.models import Review
+
+        cache.get_cache().clear()
+        first, second, third = self.create_titles(admin, user)
+        data = client.get('/api/v1/titles/top/').json()
+        assert data['window'] == '7d' and self.ids(data) == [
+            second.pk, third.pk, first.pk], (
+            'Проверьте, что `/api/v1/titles/top/` сортирует произведения по '
+            'средней оценке за окно.'
+        )
+        assert data['results'][0]['window_rating'] == 10
+        assert data['results'][0]['name'] == 'Второе'
+
+        data = client.get('/api/v1/titles/top/?order=reviews').json()
+        assert self.ids(data) == [third.pk, first.pk, second.pk]
+        assert [item['window_review_count'] for item in data['results']] \
+            == [2, 2, 1]
+        data = client.get(
+            '/api/v1/titles/top/?category=movie&order=reviews').json()
+        assert self.ids(data) == [first.pk, second.pk]
+        data = client.get('/api/v1/titles/top/?genre=drama').json()
+        assert self.ids(data) == [first.pk]
+
+        Review.objects.filter(title=second).delete()
+        data = client.get('/api/v1/titles/top/').json()
+        assert self.ids(data) == [third.pk, first.pk], (
+            'Проверьте, что удаление отзыва убирает его из статистики.'
+        )
+        for params in ('window=0d', 'window=week', 'window=400d',
+                       'order=name', 'limit=1000'):
+            response = client.get(f'/api/v1/titles/top/?{params}')
+            assert response.status_code == 400, params
+
+    def test_02_window_and_rebuild(self, client, admin, user):
+        from django.core.management import call_command
+        from reviews.models import Review, TitleDailyStats
+
+        first, second, third = self.create_titles(admin, user)
+        stats = {
+            (row.title_id, row.day): (row.review_count, row.score_sum)
+            for row in TitleDailyStats.objects.all()
+        }
+        today = timezone.localdate()
+        assert stats == {
+            (first.pk, today): (2, 14), (second.pk, today): (1, 10),
+            (third.pk, today): (2, 18)}, (
+            'Проверьте, что запись отзыва сдвигает статистику за день.'
+        )
+
+        Review.objects.filter(title=second).update(
+            pub_date=timezone.now() - timedelta(days=10))
+        call_command('rebuild_ratings', stdout=StringIO())
+        data = client.get('/api/v1/titles/top/?window=7d').json()
+        assert second.pk not in self.ids(data), (
+            'Проверьте, что отзывы вне окна не учитываются.'
+        )
+        data = client.get('/api/v1/titles/top/?window=30d').json()
+        assert self.ids(data)[0] == second.pk
+        data = client.get('/api/v1/titles/top/?window=all&limit=2').json()
+        assert data['window'] == 'all' and self.ids(data) == [
+            second.pk, third.pk]
+
+    def test_03_bulk_reviews_feed_stats(self, admin_client, admin):
+        from reviews.models import Title, TitleDailyStats
+
+        title = Title.objects.create(name='Побег', year=1994)
+        response = admin_client.post(
+            f'/api/v1/titles/{title.pk}/reviews/bulk/',
+            data=json.dumps([{'text': 'Отзыв', 'score': 7}]),
+            content_type='application/json')
+        assert response.status_code == 201
+        row = TitleDailyStats.objects.get(title=title)
+        assert (row.review_count, row.score_sum) == (1, 7), (
+            'Проверьте, что массовое создание отзывов обновляет '
+            'статистику за день.'
+        )
+
+    def test_04_window_moves_at_midnight(self, client, admin, user,
+                                         monkeypatch):
+        from api import cache
+
+        cache.get_cache().clear()
+        self.create_titles(admin, user)
+        url = '/api/v1/titles/top/?window=7d'
+        response = client.get(url)
+        etag = response['ETag']
+        assert len(response.json()['results']) == 3
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        later = timezone.localdate() + timedelta(days=10)
+        monkeypatch.setattr(timezone, 'localdate', lambda *args: later)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что ETag рейтинга за окно меняется со сменой дня.'
+        )
+        assert response.json()['results'] == [], (
+            'Проверьте, что закэшированный рейтинг за окно не отдаётся '
+            'на следующий день.'
+        )
+
+    def test_05_window_uses_day_index(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.leaderboard import top_titles
+        from reviews.models import Title, TitleDailyStats
+
+        if connection.vendor != 'sqlite':
+            pytest.skip('План проверяется только для SQLite.')
+        today = timezone.localdate()
+        titles = [
+            Title.objects.create(name=f'Произведение {number}', year=2000)
+            for number in range(20)
+        ]
+        TitleDailyStats.objects.bulk_create(
+            TitleDailyStats(
+                title=title, day=today - timedelta(days=days),
+                review_count=1, score_sum=5)
+            for title in titles for days in range(60))
+        with CaptureQueriesContext(connection) as context:
+            top_titles(days=7)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'EXPLAIN QUERY PLAN {context.captured_queries[-1]["sql"]}')
+            plan = ' '.join(row[-1] for row in cursor.fetchall())
+        assert 'COVERING INDEX titledailystats_day_idx' in plan, (
+            'Проверьте, что окно `/titles/top/` читает статистику по '
+            f'покрывающему индексу (day, title), а не целиком: {plan}'
+        )